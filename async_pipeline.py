@@ -0,0 +1,211 @@
+"""
+Organización asíncrona por etapas para integrarse en aplicaciones asyncio.
+
+La organización se divide en cuatro etapas conectadas por colas acotadas:
+
+1. Producción de registros: lee el archivo de datos por bloques y agrupa
+   los registros por factura.
+2. Búsqueda del origen: localiza cada factura en el índice de PDFs.
+3. Directorios: planifica y crea las carpetas de destino y descarta los
+   archivos que el manifiesto da por actualizados.
+4. Colocación: copia o enlaza los PDFs.
+
+Toda la E/S se ejecuta en pools de hilos propios de cada etapa, de modo que
+el bucle de eventos nunca se bloquea; el número de hilos de lectura, de
+directorios y de colocación se elige por separado. Las colas se llenan con bloques de
+facturas (Config.ASYNC_SLICE_SIZE) y tienen un tamaño máximo, así que un
+productor rápido espera a las etapas lentas en lugar de acumular memoria.
+"""
+
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from itertools import islice
+from typing import Iterable, Iterator, List, Optional, Set, Tuple
+
+from config import Config
+from pdf_index import PDFEntry
+
+Record = Tuple[str, str, str, str]
+InvoiceGroup = Tuple[str, List[Record]]
+
+# Marca de fin de una cola
+_DONE = None
+
+
+def _shutdown(executors: Iterable[ThreadPoolExecutor]) -> None:
+    # Se ejecuta fuera del bucle de eventos: espera a los hilos ocupados y cancela lo pendiente
+    for executor in executors:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class AsyncPipeline:
+    """Ejecuta la organización de un FileOrganizer como un pipeline asyncio."""
+
+    def __init__(self, organizer, placement_workers: int,
+                 queue_size: int = Config.ASYNC_QUEUE_SIZE,
+                 slice_size: int = Config.ASYNC_SLICE_SIZE,
+                 load_workers: int = Config.ASYNC_LOAD_WORKERS,
+                 directory_workers: int = Config.ASYNC_DIRECTORY_WORKERS):
+        """
+        Inicializa el pipeline.
+
+        Args:
+            organizer: FileOrganizer ya preparado (índice de PDFs y manifiesto cargados)
+            placement_workers: Hilos y tareas de la etapa de colocación
+            queue_size: Máximo de bloques esperando entre dos etapas
+            slice_size: Facturas por bloque
+            load_workers: Hilos de la etapa de lectura (los bloques se leen de uno
+                en uno; el resto de hilos agrupa por factura mientras tanto)
+            directory_workers: Hilos de la etapa de directorios (el plan se
+                actualiza de uno en uno; el manifiesto y el disco se consultan en paralelo)
+        """
+        self.organizer = organizer
+        self.placement_workers = max(1, placement_workers)
+        self.queue_size = max(1, queue_size)
+        self.slice_size = max(1, slice_size)
+        self.load_workers = max(1, load_workers)
+        self.directory_workers = max(1, directory_workers)
+        self._batches_lock = threading.Lock()
+        self._plan_lock = threading.Lock()
+        # Facturas colocándose ahora mismo: una factura repartida entre dos bloques
+        # de registros no se coloca desde dos hilos a la vez (como la clave de CopyEngine)
+        self._active_invoices: Set[str] = set()
+        self._invoices_released = threading.Condition()
+        # Se activa al cancelar: los hilos de colocación dejan el bloque en curso en la siguiente factura
+        self._cancelled = threading.Event()
+
+    def _next_slices(self, batches: Iterator[List[Record]]) -> Optional[List[List[InvoiceGroup]]]:
+        # Se ejecuta en el pool de lectura: leer un bloque y agruparlo no toca el bucle de eventos
+        with self._batches_lock:
+            records_data = next(batches, None)
+        if records_data is None:
+            return None
+        self.organizer._count('total_records', len(records_data))
+        self.organizer.progress.records_loaded(len(records_data))
+        invoices = {}
+        for record in records_data:
+            invoices.setdefault(record[2], []).append(record)
+        groups = iter(invoices.items())
+        return list(iter(lambda: list(islice(groups, self.slice_size)), []))
+
+    async def _produce(self, executor: ThreadPoolExecutor, batches: Iterator[List[Record]],
+                       output: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            slices = await loop.run_in_executor(executor, self._next_slices, batches)
+            if slices is None:
+                break
+            for invoice_slice in slices:
+                await output.put(invoice_slice)
+
+    async def _produce_all(self, executor: ThreadPoolExecutor, output: asyncio.Queue) -> None:
+        batches = self.organizer._record_batches()
+        await asyncio.gather(*(self._produce(executor, batches, output) for _ in range(self.load_workers)))
+        await output.put(_DONE)
+
+    async def _lookup(self, source: asyncio.Queue, output: asyncio.Queue) -> None:
+        # El índice está en memoria: buscar un bloque de facturas no hace E/S
+        while True:
+            invoice_slice = await source.get()
+            if invoice_slice is _DONE:
+                break
+            await output.put([(invoice, records, self.organizer.pdf_index.lookup(invoice))
+                              for invoice, records in invoice_slice])
+        for _ in range(self.directory_workers):
+            await output.put(_DONE)
+
+    def _prepare_directories(self, lookup_slice) -> List[Tuple[list, Optional[PDFEntry]]]:
+        from file_organizer import PDFRecord
+
+        organizer = self.organizer
+        records = [record for _, invoice_records, _ in lookup_slice for record in invoice_records]
+        # El plan de directorios no admite escrituras concurrentes
+        with self._plan_lock:
+            destinations = iter(organizer.plan_directories(records))
+            organizer.directory_plan.create(organizer._report_folder_created)
+
+        prepared = []
+        for _, invoice_records, source_entry in lookup_slice:
+            targets = [(PDFRecord(*record), next(destinations)) for record in invoice_records]
+            pending = organizer._pending_targets(targets, source_entry)
+            if pending:
+                prepared.append((pending, source_entry))
+        return prepared
+
+    async def _create_directories(self, executor: ThreadPoolExecutor,
+                                  source: asyncio.Queue, output: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            lookup_slice = await source.get()
+            if lookup_slice is _DONE:
+                break
+            prepared = await loop.run_in_executor(executor, self._prepare_directories, lookup_slice)
+            if prepared:
+                await output.put(prepared)
+
+    async def _create_all_directories(self, executor: ThreadPoolExecutor,
+                                      source: asyncio.Queue, output: asyncio.Queue) -> None:
+        await asyncio.gather(*(self._create_directories(executor, source, output)
+                               for _ in range(self.directory_workers)))
+        for _ in range(self.placement_workers):
+            await output.put(_DONE)
+
+    def _place_slice(self, prepared) -> None:
+        for targets, source_entry in prepared:
+            if self._cancelled.is_set():
+                return
+            invoice = targets[0][0].invoice
+            with self._invoices_released:
+                self._invoices_released.wait_for(lambda: invoice not in self._active_invoices)
+                self._active_invoices.add(invoice)
+            try:
+                self.organizer._copy_invoice(targets, source_entry)
+            finally:
+                with self._invoices_released:
+                    self._active_invoices.discard(invoice)
+                    self._invoices_released.notify_all()
+
+    async def _place(self, executor: ThreadPoolExecutor, source: asyncio.Queue) -> None:
+        loop = asyncio.get_running_loop()
+        while True:
+            prepared = await source.get()
+            if prepared is _DONE:
+                break
+            await loop.run_in_executor(executor, self._place_slice, prepared)
+
+    async def run(self) -> None:
+        """
+        Ejecuta todas las etapas hasta procesar todos los registros.
+
+        Si una etapa falla, se cancelan las demás y se propaga el error. Los
+        pools se cierran sin bloquear el bucle de eventos: el cierre espera en
+        otro hilo a que terminen las operaciones en curso y descarta las que
+        aún no habían empezado.
+        """
+        lookup_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        directory_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+        placement_queue: asyncio.Queue = asyncio.Queue(self.queue_size)
+
+        load_executor = ThreadPoolExecutor(self.load_workers, thread_name_prefix="organizer-load")
+        directory_executor = ThreadPoolExecutor(self.directory_workers, thread_name_prefix="organizer-dirs")
+        placement_executor = ThreadPoolExecutor(self.placement_workers, thread_name_prefix="organizer-place")
+        tasks = [
+            asyncio.ensure_future(self._produce_all(load_executor, lookup_queue)),
+            asyncio.ensure_future(self._lookup(lookup_queue, directory_queue)),
+            asyncio.ensure_future(self._create_all_directories(directory_executor, directory_queue, placement_queue)),
+        ] + [
+            asyncio.ensure_future(self._place(placement_executor, placement_queue))
+            for _ in range(self.placement_workers)
+        ]
+        try:
+            await asyncio.gather(*tasks)
+        except BaseException:
+            self._cancelled.set()
+            for task in tasks:
+                task.cancel()
+            await asyncio.gather(*tasks, return_exceptions=True)
+            raise
+        finally:
+            executors = (load_executor, directory_executor, placement_executor)
+            await asyncio.shield(asyncio.get_running_loop().run_in_executor(None, _shutdown, executors))
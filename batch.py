@@ -0,0 +1,218 @@
+"""
+Modo por lotes: varios archivos de datos contra un mismo directorio de PDFs.
+
+El índice de PDFs, el plan de directorios, el manifiesto y el pool de copia
+se crean una sola vez y se comparten entre todos los trabajos.
+"""
+
+import glob
+from contextlib import nullcontext
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from config import Config
+from copy_engine import CopyEngine
+from data_handler import DataHandler
+from dedup import ContentStore, HashCache
+from directory_plan import DirectoryPlan
+from exceptions import DataFileError, FileOrganizerError
+from file_organizer import FileOrganizer, OrganizationStats
+from manifest import RunManifest
+from pdf_index import PDFIndex
+from placement import FilePlacer
+from progress import ConsoleReporter, ProgressReporter
+
+
+def collect_data_files(sources: Iterable[str]) -> List[Path]:
+    """
+    Resuelve la lista de archivos de datos de un lote.
+
+    Cada fuente puede ser un archivo, un directorio (se toman sus archivos
+    CSV/Excel) o un patrón glob.
+
+    Args:
+        sources: Rutas, directorios o patrones
+
+    Returns:
+        Lista de archivos sin duplicados, en el orden indicado
+
+    Raises:
+        DataFileError: Si una fuente no corresponde a ningún archivo
+    """
+    files: List[Path] = []
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            matches = sorted(
+                child for child in path.iterdir()
+                if child.is_file() and child.suffix.lower() in Config.DATA_FILE_EXTENSIONS
+            )
+        elif glob.has_magic(source):
+            matches = sorted(
+                Path(match) for match in glob.glob(source)
+                if Path(match).suffix.lower() in Config.DATA_FILE_EXTENSIONS
+            )
+        else:
+            matches = [path]
+
+        if not matches:
+            raise DataFileError(f"No se encontraron archivos de datos en: {source}")
+        files.extend(matches)
+
+    unique: Dict[Path, None] = dict.fromkeys(files)
+    return list(unique)
+
+
+@dataclass
+class BatchResult:
+    """Resultado de un lote de organizaciones."""
+    # Estadísticas de cada trabajo; las de un trabajo fallido son las parciales hasta el error
+    jobs: Dict[str, OrganizationStats] = field(default_factory=dict)
+    # Trabajos fallidos y su error
+    errors: Dict[str, str] = field(default_factory=dict)
+    total: OrganizationStats = field(default_factory=OrganizationStats)
+
+
+class BatchOrganizer:
+    """Organiza varios archivos de datos compartiendo índice, plan y pool."""
+
+    def __init__(self, data_files: Iterable, pdf_directory: str, output_directory: str,
+                 workers: int = Config.DEFAULT_WORKERS,
+                 max_inflight_bytes: Optional[int] = Config.MAX_INFLIGHT_BYTES,
+                 placement_mode: str = Config.DEFAULT_PLACEMENT_MODE,
+                 use_manifest: bool = Config.USE_MANIFEST,
+                 streaming: bool = False, chunk_size: int = Config.CHUNK_SIZE,
+                 use_cache: bool = Config.USE_RECORD_CACHE,
+                 progress: Optional[ProgressReporter] = None,
+                 dedup: bool = Config.USE_DEDUP,
+                 backend: str = Config.DATA_BACKEND):
+        """
+        Inicializa el lote.
+
+        Args:
+            data_files: Archivos de datos a procesar
+            pdf_directory: Directorio con los PDFs originales
+            output_directory: Directorio donde crear la estructura
+            workers: Hilos de copia compartidos por todos los trabajos
+            max_inflight_bytes: Máximo de bytes copiándose a la vez
+            placement_mode: Modo de colocación de archivos
+            use_manifest: Si se usa el manifiesto incremental
+            streaming: Si los CSV se leen por bloques
+            chunk_size: Registros por bloque
+            use_cache: Si se usa la caché de registros normalizados
+            progress: Reporter de progreso compartido (por defecto, consola)
+            dedup: Si los PDFs idénticos se copian una sola vez
+            backend: Biblioteca de DataFrames con la que se leen los archivos
+        """
+        self.data_files = [Path(data_file) for data_file in data_files]
+        self.pdf_directory = Path(pdf_directory)
+        self.output_directory = Path(output_directory)
+        self.workers = max(1, workers)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.placement_mode = placement_mode
+        self.use_manifest = use_manifest
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.use_cache = use_cache
+        self.progress = progress if progress is not None else ConsoleReporter()
+        self.dedup = dedup
+        self.backend = backend
+        self.placer = FilePlacer(placement_mode)
+        self.directory_plan = DirectoryPlan(self.output_directory)
+        self.pdf_index: PDFIndex = None
+        self.manifest: Optional[RunManifest] = None
+        self.content_store: Optional[ContentStore] = None
+        self.organizers: Dict[str, FileOrganizer] = {}
+        self.result = BatchResult()
+
+    def _create_organizer(self, data_file: Path) -> FileOrganizer:
+        organizer = FileOrganizer(
+            DataHandler(str(data_file), use_cache=self.use_cache, backend=self.backend),
+            str(self.pdf_directory),
+            str(self.output_directory),
+            workers=self.workers,
+            max_inflight_bytes=self.max_inflight_bytes,
+            placement_mode=self.placement_mode,
+            use_manifest=self.use_manifest,
+            streaming=self.streaming,
+            chunk_size=self.chunk_size,
+            progress=self.progress
+        )
+        # Estado compartido entre todos los trabajos del lote
+        organizer.pdf_index = self.pdf_index
+        organizer.manifest = self.manifest
+        organizer.directory_plan = self.directory_plan
+        organizer.placer = self.placer
+        organizer.content_store = self.content_store
+        return organizer
+
+    def organize_all(self) -> BatchResult:
+        """
+        Procesa todos los trabajos del lote.
+
+        Un error en un archivo de datos no detiene el resto del lote; el
+        trabajo queda marcado como fallido en BatchResult.errors y conserva
+        en BatchResult.jobs lo que llegó a organizar.
+
+        Returns:
+            Estadísticas por trabajo y agregadas
+        """
+        print(f"=== INICIANDO LOTE ({len(self.data_files)} archivos) ===")
+        self.pdf_index = PDFIndex.build(self.pdf_directory)
+        if self.dedup:
+            self.content_store = ContentStore.build(self.pdf_index, HashCache().load())
+        self.manifest = RunManifest(self.output_directory).load() if self.use_manifest else None
+        engine = CopyEngine(self.workers, self.max_inflight_bytes) if self.workers > 1 else None
+        self.progress.start(self.output_directory)
+
+        try:
+            with engine or nullcontext():
+                for data_file in self.data_files:
+                    print(f"\n📄 Procesando: {data_file.name}")
+                    try:
+                        organizer = self._create_organizer(data_file)
+                        self.organizers[str(data_file)] = organizer
+                        organizer.process_records(engine)
+                    except FileOrganizerError as e:
+                        print(f"❌ ERROR en {data_file.name}: {e}")
+                        self.result.errors[str(data_file)] = str(e)
+                    except Exception as e:
+                        # Un error inesperado tampoco detiene el lote, pero se informa su tipo
+                        print(f"❌ ERROR inesperado en {data_file.name}: {type(e).__name__}: {e}")
+                        self.result.errors[str(data_file)] = f"{type(e).__name__}: {e}"
+        finally:
+            if self.content_store is not None:
+                self.content_store.save()
+            if self.manifest is not None:
+                self.manifest.close()
+            self.progress.finish()
+
+        # Con el pool ya vacío las estadísticas de cada trabajo son definitivas,
+        # también las parciales de los que fallaron (sus copias ya encoladas terminaron)
+        for name, organizer in self.organizers.items():
+            self.result.jobs[name] = organizer.stats
+        self.result.total = OrganizationStats.combine(self.result.jobs.values())
+        self.result.total.unmatched_pdfs = len(self.pdf_index.unmatched())
+        return self.result
+
+    def print_summary(self) -> None:
+        """Imprime el resumen por trabajo y el total del lote."""
+        print(f"\n=== RESUMEN DEL LOTE ===")
+        for name, stats in self.result.jobs.items():
+            status = " (fallido, parcial)" if name in self.result.errors else ""
+            print(f"📄 {Path(name).name}{status}: {stats.total_records} registros, "
+                  f"{stats.files_moved} copiados, {stats.files_not_found} no encontrados, "
+                  f"{stats.files_skipped} sin cambios")
+        for name, error in self.result.errors.items():
+            print(f"❌ {Path(name).name}: {error}")
+
+        total = self.result.total
+        print(f"\nCarpetas creadas: {total.folders_created}")
+        print(f"Archivos copiados exitosamente: {total.files_moved}")
+        print(f"Archivos no encontrados: {total.files_not_found}")
+        print(f"Archivos sin cambios (omitidos): {total.files_skipped}")
+        print(f"Total de registros procesados: {total.total_records}")
+        print(f"PDFs sin referencia en los datos: {total.unmatched_pdfs}")
+        if total.bytes_saved:
+            print(f"Espacio ahorrado por deduplicación: {total.bytes_saved / (1024 * 1024):.1f} MB")
@@ -0,0 +1,69 @@
+#!/usr/bin/env python3
+"""
+Benchmark del arranque en frío de la línea de comandos.
+
+Mide el tiempo de `python cli.py --help` en procesos nuevos y comprueba
+que ni tkinter ni pandas se importan para procesar los argumentos.
+
+Uso:
+    python benchmarks/bench_cli_startup.py --repeat 10
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+
+
+def time_help(repeat: int) -> list:
+    """Devuelve los tiempos en segundos de varias ejecuciones de --help."""
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, str(PROJECT_DIR / "cli.py"), "--help"],
+            check=True, stdout=subprocess.DEVNULL
+        )
+        timings.append(time.perf_counter() - start)
+    return timings
+
+
+def heavy_modules_imported() -> str:
+    """Indica qué módulos pesados quedan cargados tras procesar --help."""
+    code = (
+        "import contextlib, io, sys, cli\n"
+        "with contextlib.redirect_stdout(io.StringIO()):\n"
+        "    try:\n"
+        "        cli.main(['--help'])\n"
+        "    except SystemExit:\n"
+        "        pass\n"
+        "print(','.join(m for m in ('tkinter', 'pandas') if m in sys.modules))\n"
+    )
+    result = subprocess.run(
+        [sys.executable, "-c", code], cwd=PROJECT_DIR,
+        check=True, capture_output=True, text=True
+    )
+    return result.stdout.strip()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=10)
+    args = parser.parse_args()
+
+    baseline = time_help(1)[0]
+    timings = time_help(args.repeat)
+    print(f"Primera ejecución: {baseline * 1000:7.1f} ms")
+    print(f"Mediana ({args.repeat} ejecuciones): {statistics.median(timings) * 1000:7.1f} ms")
+    print(f"Mínimo: {min(timings) * 1000:7.1f} ms")
+
+    heavy = heavy_modules_imported()
+    print(f"Módulos pesados importados: {heavy or 'ninguno'}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Benchmark de la carga de archivos Excel.
+
+Genera un libro con las columnas requeridas más columnas de relleno y
+compara la lectura completa con pd.read_excel (comportamiento anterior)
+con la lectura podada de DataHandler.load_data.
+
+Uso:
+    python benchmarks/bench_excel_loading.py --rows 50000 --extra-columns 20
+"""
+
+import argparse
+import contextlib
+import io
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+# Añadir el directorio raíz del proyecto al path para importar los módulos
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from data_handler import DataHandler, get_excel_engine
+
+
+def generate_workbook(path: Path, rows: int, extra_columns: int) -> None:
+    """
+    Genera un libro Excel de prueba.
+
+    Args:
+        path: Ruta del archivo a crear
+        rows: Número de filas
+        extra_columns: Número de columnas adicionales no requeridas
+    """
+    data = {
+        'Memo': [f"Ubicación {i % 25}" for i in range(rows)],
+        'Nombre del Solicitante': [f"Solicitante {i % 400}" for i in range(rows)],
+        'Factura': [f"FAC{i:07d}" for i in range(rows)],
+        'Name': [f"Proveedor {i % 3000}" for i in range(rows)],
+    }
+    for column in range(extra_columns):
+        data[f"Extra {column}"] = [i * column for i in range(rows)]
+    pd.DataFrame(data).to_excel(path, index=False)
+
+
+def time_call(function, repeat: int) -> float:
+    """Devuelve el mejor tiempo en segundos de varias ejecuciones."""
+    best = float('inf')
+    for _ in range(repeat):
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=20_000)
+    parser.add_argument('--extra-columns', type=int, default=20)
+    parser.add_argument('--repeat', type=int, default=3)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as temporary:
+        path = Path(temporary) / "datos.xlsx"
+        print(f"Generando libro: {args.rows} filas, {args.extra_columns} columnas extra...")
+        generate_workbook(path, args.rows, args.extra_columns)
+        print(f"Tamaño del archivo: {path.stat().st_size / 1024 / 1024:.1f} MB")
+
+        baseline = time_call(lambda: pd.read_excel(path), args.repeat)
+        pruned = time_call(lambda: DataHandler(str(path)).load_data(), args.repeat)
+
+        print(f"pd.read_excel completo:      {baseline:8.3f} s")
+        print(f"DataHandler.load_data ({get_excel_engine() or 'openpyxl'}): {pruned:8.3f} s")
+        print(f"Aceleración: {baseline / pruned:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,83 @@
+#!/usr/bin/env python3
+"""
+Benchmark de memoria de la representación de registros.
+
+Compara la memoria retenida por la lista de tuplas de
+get_processed_records más los PDFRecord creados al organizar
+(comportamiento anterior) con la de RecordStore más un bloque
+materializado de Config.CHUNK_SIZE registros.
+
+Uso:
+    python benchmarks/bench_record_memory.py --rows 1000000
+"""
+
+import argparse
+import gc
+import sys
+import time
+import tracemalloc
+from pathlib import Path
+
+# Añadir el directorio raíz del proyecto al path para importar los módulos
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from config import Config
+from data_handler import RECORD_COLUMNS, normalize_record_columns, record_tuples
+from dataset_generator import DatasetSpec, build_dataframe
+from file_organizer import PDFRecord
+from record_store import RecordStore
+
+
+def measure(frame, build) -> tuple:
+    """
+    Mide la memoria retenida por lo que devuelve build.
+
+    Las columnas normalizadas se crean dentro de la medición y se liberan
+    antes de tomarla, como ocurre en DataHandler.
+
+    Returns:
+        (objeto construido, MB retenidos, MB de pico, segundos)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    columns = normalize_record_columns(frame)
+    result = build(columns)
+    del columns
+    elapsed = time.perf_counter() - start
+    gc.collect()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current / 1024 / 1024, peak / 1024 / 1024, elapsed
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, default=1_000_000)
+    parser.add_argument('--suppliers', type=int, default=2000)
+    args = parser.parse_args()
+
+    print(f"Generando {args.rows} registros...")
+    frame = build_dataframe(DatasetSpec(rows=args.rows, suppliers=args.suppliers))
+
+    def as_tuples(columns):
+        records = record_tuples(columns)
+        return records, [PDFRecord(*record) for record in records]
+
+    def as_store(columns):
+        store = RecordStore.from_columns(*(columns[column] for column in RECORD_COLUMNS))
+        return store, store.materialize(0, Config.CHUNK_SIZE)
+
+    tuples, tuple_mb, tuple_peak, tuple_seconds = measure(frame, as_tuples)
+    del tuples
+    (store, _), store_mb, store_peak, store_seconds = measure(frame, as_store)
+
+    print(f"Tuplas + PDFRecord:        {tuple_mb:8.1f} MB retenidos (pico {tuple_peak:8.1f} MB, {tuple_seconds:.2f} s)")
+    print(f"RecordStore + un bloque:   {store_mb:8.1f} MB retenidos (pico {store_peak:8.1f} MB, {store_seconds:.2f} s)")
+    print(f"  {store!r}: {store.nbytes / 1024 / 1024:.1f} MB")
+    print(f"Reducción: {tuple_mb / store_mb:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
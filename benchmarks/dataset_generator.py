@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+Generador de conjuntos de datos sintéticos de órdenes de compra.
+
+Crea un archivo de datos (CSV y/o XLSX) con las columnas requeridas y un
+directorio de PDFs dispersos (sparse) del tamaño indicado, dejando sin PDF
+la proporción de facturas que se pida.
+
+Uso:
+    python benchmarks/dataset_generator.py salida/ --rows 100000 --formats csv xlsx
+"""
+
+import argparse
+import random
+import sys
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Dict, Iterable
+
+# Añadir el directorio raíz del proyecto al path para importar los módulos
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import pandas as pd
+
+from config import Config
+
+# Cabecera mínima para que los archivos generados parezcan PDFs
+_PDF_HEADER = b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n"
+
+
+@dataclass
+class DatasetSpec:
+    """Parámetros de un conjunto de datos sintético."""
+    rows: int = 1000
+    locations: int = 20
+    requesters: int = 300
+    suppliers: int = 2000
+    missing_pdf_ratio: float = 0.05
+    pdf_size: int = 64 * 1024
+    seed: int = 42
+
+
+@dataclass
+class Dataset:
+    """Archivos generados para un conjunto de datos."""
+    spec: DatasetSpec
+    data_files: Dict[str, Path] = field(default_factory=dict)
+    pdf_directory: Path = None
+    pdf_count: int = 0
+
+
+def build_dataframe(spec: DatasetSpec) -> pd.DataFrame:
+    """
+    Construye los registros sintéticos.
+
+    Los valores de cada columna se eligen con una distribución sesgada
+    (unos pocos valores muy frecuentes), como en los datos reales.
+
+    Args:
+        spec: Parámetros del conjunto de datos
+
+    Returns:
+        DataFrame con las columnas requeridas y una columna de relleno
+    """
+    rng = random.Random(spec.seed)
+
+    def skewed(prefix: str, cardinality: int):
+        weights = [1 / (rank + 1) for rank in range(cardinality)]
+        values = [f"{prefix} {rank:05d}" for rank in range(cardinality)]
+        return rng.choices(values, weights=weights, k=spec.rows)
+
+    return pd.DataFrame({
+        'Memo': skewed("Ubicación", spec.locations),
+        'Nombre del Solicitante': skewed("Solicitante", spec.requesters),
+        'Factura': [f"FAC{i:08d}" for i in range(spec.rows)],
+        'Name': skewed("Proveedor", spec.suppliers),
+        'Monto': [round(rng.uniform(10, 10_000), 2) for _ in range(spec.rows)],
+    })
+
+
+def create_sparse_pdf(path: Path, size: int) -> None:
+    """
+    Crea un PDF disperso: solo la cabecera ocupa espacio real en disco.
+
+    Args:
+        path: Ruta del archivo
+        size: Tamaño aparente en bytes
+    """
+    with open(path, 'wb') as f:
+        f.write(_PDF_HEADER)
+        f.truncate(max(size, len(_PDF_HEADER)))
+
+
+def generate_dataset(directory: Path, spec: DatasetSpec,
+                     formats: Iterable[str] = ('csv',)) -> Dataset:
+    """
+    Genera un conjunto de datos completo en un directorio.
+
+    Args:
+        directory: Directorio donde crear los archivos
+        spec: Parámetros del conjunto de datos
+        formats: Formatos del archivo de datos ('csv' y/o 'xlsx')
+
+    Returns:
+        Descripción de los archivos generados
+    """
+    directory = Path(directory)
+    directory.mkdir(parents=True, exist_ok=True)
+    dataframe = build_dataframe(spec)
+    dataset = Dataset(spec=spec, pdf_directory=directory / "pdfs")
+
+    for data_format in formats:
+        path = directory / f"datos.{data_format}"
+        if data_format == 'csv':
+            dataframe.to_csv(path, index=False)
+        elif data_format == 'xlsx':
+            dataframe.to_excel(path, index=False)
+        else:
+            raise ValueError(f"Formato no soportado: {data_format}")
+        dataset.data_files[data_format] = path
+
+    dataset.pdf_directory.mkdir(exist_ok=True)
+    rng = random.Random(spec.seed + 1)
+    for invoice in dataframe['Factura']:
+        if rng.random() >= spec.missing_pdf_ratio:
+            create_sparse_pdf(dataset.pdf_directory / f"{invoice}{Config.PDF_EXTENSION}", spec.pdf_size)
+            dataset.pdf_count += 1
+
+    return dataset
+
+
+def add_spec_arguments(parser: argparse.ArgumentParser) -> None:
+    """Añade al parser los parámetros de DatasetSpec."""
+    defaults = DatasetSpec()
+    parser.add_argument('--locations', type=int, default=defaults.locations)
+    parser.add_argument('--requesters', type=int, default=defaults.requesters)
+    parser.add_argument('--suppliers', type=int, default=defaults.suppliers)
+    parser.add_argument('--missing-pdf-ratio', type=float, default=defaults.missing_pdf_ratio)
+    parser.add_argument('--pdf-size', type=int, default=defaults.pdf_size,
+                        help="Tamaño aparente de cada PDF en bytes")
+    parser.add_argument('--seed', type=int, default=defaults.seed)
+
+
+def spec_from_arguments(args: argparse.Namespace, rows: int) -> DatasetSpec:
+    """Construye un DatasetSpec a partir de los argumentos."""
+    return DatasetSpec(
+        rows=rows,
+        locations=args.locations,
+        requesters=args.requesters,
+        suppliers=args.suppliers,
+        missing_pdf_ratio=args.missing_pdf_ratio,
+        pdf_size=args.pdf_size,
+        seed=args.seed
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('directory', help="Directorio donde crear el conjunto de datos")
+    parser.add_argument('--rows', type=int, default=DatasetSpec.rows)
+    parser.add_argument('--formats', nargs='+', choices=('csv', 'xlsx'), default=['csv'])
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    dataset = generate_dataset(Path(args.directory), spec_from_arguments(args, args.rows), args.formats)
+    for data_format, path in dataset.data_files.items():
+        print(f"Archivo {data_format}: {path}")
+    print(f"PDFs generados: {dataset.pdf_count} en {dataset.pdf_directory}")
+
+
+if __name__ == "__main__":
+    main()
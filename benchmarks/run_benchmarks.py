@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Suite de benchmarks del organizador de órdenes de compra.
+
+Genera conjuntos de datos sintéticos de distintos tamaños y mide por
+separado cada etapa: carga, validación, extracción de registros, índice de
+PDFs, planificación de directorios, creación de directorios, copia e
+impresión de la estructura. Los resultados se guardan en JSON para poder
+compararlos entre commits.
+
+Uso:
+    python benchmarks/run_benchmarks.py --rows 1000 10000 100000 --output base.json
+    python benchmarks/run_benchmarks.py --rows 1000 10000 100000 --compare base.json
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import platform
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict
+
+# Añadir el directorio raíz del proyecto al path para importar los módulos
+PROJECT_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(PROJECT_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+import pandas as pd
+
+from config import Config
+from data_handler import DataHandler
+from dataset_generator import add_spec_arguments, generate_dataset, spec_from_arguments
+from directory_plan import DirectoryPlan
+from file_organizer import FileOrganizer
+from pdf_index import PDFIndex
+
+STAGES = (
+    'load', 'validate', 'record_extraction', 'pdf_index', 'directory_planning',
+    'directory_creation', 'copying', 'structure_printing',
+)
+
+
+def git_revision() -> str:
+    """Devuelve el commit actual del repositorio, si se puede obtener."""
+    try:
+        return subprocess.run(
+            ['git', 'rev-parse', '--short', 'HEAD'], cwd=PROJECT_DIR,
+            check=True, capture_output=True, text=True
+        ).stdout.strip()
+    except Exception:
+        return "desconocido"
+
+
+def run_stages(data_file: Path, pdf_directory: Path, output_directory: Path,
+               args: argparse.Namespace) -> Dict[str, float]:
+    """
+    Ejecuta una organización completa midiendo cada etapa.
+
+    Args:
+        data_file: Archivo de datos
+        pdf_directory: Directorio de PDFs
+        output_directory: Directorio de salida (se crea vacío)
+        args: Argumentos del benchmark
+
+    Returns:
+        Segundos por etapa
+    """
+    timings: Dict[str, float] = {}
+    results = {}
+
+    def timed(stage: str, function: Callable) -> None:
+        start = time.perf_counter()
+        results[stage] = function()
+        timings[stage] = time.perf_counter() - start
+
+    shutil.rmtree(output_directory, ignore_errors=True)
+    output_directory.mkdir(parents=True)
+
+    # La salida por consola no forma parte de lo que se mide
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        handler = DataHandler(str(data_file), use_cache=False)
+        timed('load', handler.load_data)
+        timed('validate', handler.validate_columns)
+        timed('record_extraction', handler.get_processed_records)
+        records = results['record_extraction']
+        timed('pdf_index', lambda: PDFIndex.build(pdf_directory))
+        plan = DirectoryPlan(output_directory)
+        timed('directory_planning', lambda: plan.add_records(records))
+        timed('directory_creation', plan.create)
+
+        organizer = FileOrganizer(
+            records, str(pdf_directory), str(output_directory),
+            workers=args.workers,
+            placement_mode=args.mode,
+            use_manifest=False,
+            chunk_size=max(len(records), 1)
+        )
+        organizer.directory_plan = plan
+        timed('copying', organizer.organize_files)
+        timed('structure_printing', organizer.print_directory_structure)
+
+    return timings
+
+
+def compare(results: Dict, baseline_path: Path, threshold: float) -> None:
+    """Imprime la comparación por etapa con un archivo de resultados anterior."""
+    with open(baseline_path, 'r', encoding='utf-8') as f:
+        baseline = json.load(f)
+    previous = {(run['rows'], run['format']): run['stages'] for run in baseline['runs']}
+
+    print(f"\n=== COMPARACIÓN CON {baseline.get('revision', '?')} ===")
+    for run in results['runs']:
+        old = previous.get((run['rows'], run['format']))
+        if old is None:
+            continue
+        print(f"{run['rows']} filas ({run['format']}):")
+        for stage in STAGES:
+            if stage in old and old[stage] > 0:
+                ratio = run['stages'][stage] / old[stage]
+                marker = "⚠️ " if ratio > 1 + threshold else ""
+                print(f"  {marker}{stage:20s} {old[stage]:9.4f} s -> {run['stages'][stage]:9.4f} s ({ratio:5.2f}x)")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--rows', type=int, nargs='+', default=[1_000, 10_000, 100_000],
+                        help="Tamaños a medir (por ejemplo 1000 10000 100000 1000000)")
+    parser.add_argument('--formats', nargs='+', choices=('csv', 'xlsx'), default=['csv'])
+    parser.add_argument('--workers', type=int, default=Config.DEFAULT_WORKERS)
+    parser.add_argument('--mode', default=Config.DEFAULT_PLACEMENT_MODE)
+    parser.add_argument('--repeat', type=int, default=1,
+                        help="Repeticiones por tamaño; se guarda el mejor tiempo de cada etapa")
+    parser.add_argument('--workdir', help="Directorio de trabajo (por defecto, uno temporal)")
+    parser.add_argument('--output', default="benchmark_results.json")
+    parser.add_argument('--compare', help="Resultados anteriores con los que comparar")
+    parser.add_argument('--threshold', type=float, default=0.10,
+                        help="Empeoramiento relativo marcado como regresión")
+    add_spec_arguments(parser)
+    args = parser.parse_args()
+
+    results = {
+        'revision': git_revision(),
+        'timestamp': datetime.now(timezone.utc).isoformat(),
+        'python': platform.python_version(),
+        'pandas': pd.__version__,
+        'platform': platform.platform(),
+        'parameters': {key: value for key, value in vars(args).items()
+                       if key not in ('output', 'compare', 'workdir')},
+        'runs': [],
+    }
+
+    with tempfile.TemporaryDirectory(dir=args.workdir) as workdir:
+        for rows in args.rows:
+            dataset = generate_dataset(Path(workdir) / f"rows_{rows}", spec_from_arguments(args, rows), args.formats)
+            for data_format, data_file in dataset.data_files.items():
+                best: Dict[str, float] = {}
+                for _ in range(args.repeat):
+                    timings = run_stages(data_file, dataset.pdf_directory, Path(workdir) / "salida", args)
+                    best = {stage: min(best.get(stage, float('inf')), seconds)
+                            for stage, seconds in timings.items()}
+
+                results['runs'].append({'rows': rows, 'format': data_format, 'stages': best})
+                total = sum(best.values())
+                print(f"{rows:>9} filas ({data_format}): {total:8.3f} s")
+                for stage in STAGES:
+                    print(f"    {stage:20s} {best[stage]:9.4f} s")
+            shutil.rmtree(Path(workdir) / f"rows_{rows}", ignore_errors=True)
+
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(results, f, indent=2, ensure_ascii=False)
+    print(f"\nResultados guardados en {args.output}")
+
+    if args.compare:
+        compare(results, Path(args.compare), args.threshold)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,260 @@
+#!/usr/bin/env python3
+"""
+Interfaz de línea de comandos (sin interfaz gráfica) del organizador.
+
+Pensada para ejecuciones desatendidas (cron, servidores sin pantalla):
+nunca importa tkinter y solo importa pandas cuando realmente hay que leer
+un archivo de datos.
+
+Uso:
+    python cli.py datos.xlsx pdfs/ salida/ --workers 8 --mode auto
+    python cli.py "sitios/*.xlsx" pdfs/ salida/ --workers 8   # modo por lotes
+    python cli.py datos.xlsx pdfs/ salida/ --shard 2/4        # un nodo de cuatro
+    python cli.py merge salida/                               # combinar los fragmentos
+"""
+
+import argparse
+import sys
+from pathlib import Path
+from typing import List, Optional
+
+from config import Config
+from exceptions import DataFileError, FileOrganizerError, MissingColumnsError
+from placement import PLACEMENT_MODES
+from progress import PROGRESS_MODES, create_reporter
+from sharding import SHARD_STRATEGIES, parse_shard_spec, shard_file_path
+
+
+def _shard_spec(value: str):
+    try:
+        return parse_shard_spec(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e)) from None
+
+
+def build_parser() -> argparse.ArgumentParser:
+    """
+    Construye el parser de argumentos.
+
+    Returns:
+        Parser configurado
+    """
+    parser = argparse.ArgumentParser(
+        prog="organizador-ocs",
+        description="Organiza PDFs de órdenes de compra por ubicación, solicitante y proveedor."
+    )
+    parser.add_argument('data_files', nargs='+', metavar='data_file',
+                        help="Archivo con los datos (CSV o Excel); varios archivos, "
+                             "un directorio o un patrón glob activan el modo por lotes")
+    parser.add_argument('pdf_directory', help="Carpeta con los PDFs originales")
+    parser.add_argument('output_directory', help="Carpeta donde crear la estructura organizada")
+
+    performance = parser.add_argument_group("rendimiento")
+    performance.add_argument('--workers', type=int, default=Config.DEFAULT_WORKERS,
+                             help="Hilos de copia (por defecto: %(default)s)")
+    performance.add_argument('--max-inflight-mb', type=int,
+                             default=Config.MAX_INFLIGHT_BYTES // (1024 * 1024),
+                             help="Máximo de MB copiándose a la vez (por defecto: %(default)s)")
+    performance.add_argument('--mode', choices=PLACEMENT_MODES, default=Config.DEFAULT_PLACEMENT_MODE,
+                             help="Modo de colocación de archivos (por defecto: %(default)s)")
+    performance.add_argument('--stream', action='store_true',
+                             help="Leer el archivo de datos por bloques")
+    performance.add_argument('--chunk-size', type=int, default=Config.CHUNK_SIZE,
+                             help="Registros por bloque (por defecto: %(default)s)")
+    performance.add_argument('--no-manifest', action='store_true',
+                             help="No usar el manifiesto incremental; copiar todo de nuevo")
+    performance.add_argument('--no-cache', action='store_true',
+                             help="No usar la caché de registros normalizados")
+    # Sin choices: importar data_backends cargaría pandas; el nombre se valida al crear el DataHandler
+    performance.add_argument('--backend', default=Config.DATA_BACKEND,
+                             help="Biblioteca con la que se leen los datos: pandas, arrow, polars o auto "
+                                  "(la más rápida instalada); arrow y polars deben estar instalados "
+                                  "(por defecto: %(default)s)")
+    performance.add_argument('--processes', type=int, default=1,
+                             help="Procesos en paralelo, cada uno con un fragmento de los registros "
+                                  "(por defecto: %(default)s)")
+    performance.add_argument('--shard', type=_shard_spec, metavar='I/N',
+                             help="Procesar solo el fragmento I de N (varios nodos con la misma salida); "
+                                  "al terminar todos, combinar con 'merge'")
+    performance.add_argument('--shard-by', choices=SHARD_STRATEGIES, default=Config.SHARD_STRATEGY,
+                             help="Reparto de los registros entre procesos o nodos (por defecto: %(default)s)")
+    performance.add_argument('--dedup', action='store_true',
+                             help="Copiar una sola vez los PDFs idénticos y enlazar las demás apariciones")
+
+    output = parser.add_argument_group("salida")
+    output.add_argument('--progress', choices=PROGRESS_MODES, default=Config.PROGRESS_MODE,
+                        help="console: una línea por archivo; quiet: solo barra de progreso; "
+                             "verbose: barra de progreso y cada archivo en el log (por defecto: %(default)s)")
+    output.add_argument('--log-file',
+                        help=f"Log del modo verbose (por defecto: {Config.PROGRESS_LOG_FILENAME} en la salida)")
+    parser.add_argument('--watch', action='store_true',
+                        help="Tras organizar, seguir vigilando la carpeta de PDFs y el archivo de datos")
+    parser.add_argument('--show-structure', action='store_true',
+                        help="Mostrar la estructura creada al terminar")
+    parser.add_argument('--structure-limit', type=int, default=Config.STRUCTURE_PRINT_LIMIT,
+                        help="Carpetas por página de la estructura; 0 muestra todas (por defecto: %(default)s)")
+    parser.add_argument('--structure-page', type=int, default=1,
+                        help="Página de la estructura a mostrar (por defecto: %(default)s)")
+    parser.add_argument('--audit', action='store_true',
+                        help="Comprobar en disco que la estructura coincide con lo organizado")
+    parser.add_argument('--report', action='store_true',
+                        help=f"Guardar {Config.METRICS_REPORT_FILENAME} con tiempos y rendimiento en la salida")
+    return parser
+
+
+def run(args: argparse.Namespace) -> int:
+    """
+    Ejecuta la organización con los argumentos indicados.
+
+    Args:
+        args: Argumentos ya procesados
+
+    Returns:
+        Código de salida del proceso
+    """
+    # Importación diferida: aquí es donde se carga pandas
+    from batch import BatchOrganizer, collect_data_files
+    from data_handler import DataHandler
+    from file_organizer import FileOrganizer
+
+    log_file = args.log_file or Path(args.output_directory) / Config.PROGRESS_LOG_FILENAME
+    if args.shard and not args.log_file:
+        log_file = shard_file_path(args.output_directory, Config.PROGRESS_LOG_FILENAME, args.shard)
+    options = dict(
+        workers=args.workers,
+        max_inflight_bytes=args.max_inflight_mb * 1024 * 1024,
+        placement_mode=args.mode,
+        use_manifest=not args.no_manifest,
+        streaming=args.stream,
+        chunk_size=args.chunk_size,
+        dedup=args.dedup,
+        progress=create_reporter(args.progress, log_file)
+    )
+
+    data_files = collect_data_files(args.data_files)
+    if len(args.data_files) > 1 or len(data_files) > 1 or Path(args.data_files[0]).is_dir():
+        if args.watch:
+            raise DataFileError("El modo de vigilancia admite un solo archivo de datos")
+        if args.shard:
+            raise DataFileError("El reparto entre nodos admite un solo archivo de datos")
+        if args.processes > 1:
+            raise DataFileError("El modo por lotes no admite varios procesos")
+        if args.report:
+            raise DataFileError("--report no está disponible en el modo por lotes")
+        batch = BatchOrganizer(data_files, args.pdf_directory, args.output_directory,
+                               use_cache=not args.no_cache, backend=args.backend, **options)
+        result = batch.organize_all()
+        batch.print_summary()
+        return 1 if result.errors else 0
+
+    if args.shard and (args.watch or args.processes > 1):
+        raise DataFileError("--shard no se puede combinar con --watch ni con --processes")
+    if args.processes > 1:
+        if args.watch:
+            raise DataFileError("El modo de vigilancia no admite varios procesos")
+        # Cada proceso recibe sus registros ya leídos y solo devuelve sus errores de copia
+        if args.stream:
+            raise DataFileError("--stream no se puede combinar con --processes")
+        if args.progress != 'console':
+            raise DataFileError("Con --processes solo está disponible --progress console")
+        from sharded_organizer import ShardedOrganizer
+        sharded = ShardedOrganizer(
+            data_files[0], args.pdf_directory, args.output_directory,
+            processes=args.processes, shard_by=args.shard_by, workers=args.workers,
+            max_inflight_bytes=options['max_inflight_bytes'], placement_mode=args.mode,
+            use_manifest=not args.no_manifest, dedup=args.dedup, use_cache=not args.no_cache,
+            backend=args.backend, progress=options['progress'], chunk_size=args.chunk_size,
+            write_report=args.report
+        )
+        sharded.organize_all()
+        sharded.print_summary()
+        print(f"\n{Config.UI_MESSAGES['process_completed']}")
+        print(Config.UI_MESSAGES['check_folder'].format(args.output_directory))
+        return 0
+
+    data_handler = DataHandler(data_files[0], use_cache=not args.no_cache, backend=args.backend)
+    if not args.stream:
+        data_handler.validate_columns()
+        data_handler.print_preview()
+
+    organizer = FileOrganizer(data_handler, args.pdf_directory, args.output_directory,
+                              write_report=args.report, shard=args.shard, shard_by=args.shard_by, **options)
+    if args.watch:
+        from watcher import WatchOrganizer
+        WatchOrganizer(organizer).run()
+    else:
+        organizer.organize_files()
+    organizer.print_summary()
+    if args.shard:
+        organizer.save_shard_stats()
+        print(f"\nFragmento {args.shard[0] + 1}/{args.shard[1]} terminado. "
+              f"Cuando terminen todos, combina los resultados con: merge {args.output_directory}")
+    if args.show_structure:
+        organizer.print_directory_structure(args.structure_limit, args.structure_page)
+    if args.audit and not organizer.audit_directory_structure():
+        return 1
+
+    print(f"\n{Config.UI_MESSAGES['process_completed']}")
+    print(Config.UI_MESSAGES['check_folder'].format(args.output_directory))
+    return 0
+
+
+def run_merge(argv: List[str]) -> int:
+    """
+    Combina las estadísticas y manifiestos de una ejecución repartida entre nodos.
+
+    Args:
+        argv: Argumentos del comando merge
+
+    Returns:
+        Código de salida del proceso
+    """
+    parser = argparse.ArgumentParser(
+        prog="organizador-ocs merge",
+        description="Combina los resultados de los fragmentos (--shard) en un único informe."
+    )
+    parser.add_argument('output_directory', help="Carpeta de salida compartida por los fragmentos")
+    args = parser.parse_args(argv)
+
+    from sharded_organizer import merge_shards, print_merge_summary
+    stats, shard_stats = merge_shards(args.output_directory)
+    print_merge_summary(stats, shard_stats)
+    print(f"\nInforme combinado: {Path(args.output_directory) / Config.SHARD_REPORT_FILENAME}")
+    return 0
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """
+    Punto de entrada de la línea de comandos.
+
+    Args:
+        argv: Argumentos (por defecto, los de sys.argv)
+
+    Returns:
+        Código de salida del proceso
+    """
+    argv = sys.argv[1:] if argv is None else argv
+
+    try:
+        if argv and argv[0] == 'merge':
+            return run_merge(argv[1:])
+        return run(build_parser().parse_args(argv))
+
+    except MissingColumnsError as e:
+        print(f"\n❌ ERROR: {e}", file=sys.stderr)
+        print("El archivo debe contener estas columnas:", file=sys.stderr)
+        for col in Config.REQUIRED_COLUMNS:
+            print(f"  - {col}", file=sys.stderr)
+        return 1
+
+    except FileOrganizerError as e:
+        print(f"\n❌ ERROR: {e}", file=sys.stderr)
+        return 1
+
+    except KeyboardInterrupt:
+        print("\n❌ Operación interrumpida por el usuario", file=sys.stderr)
+        return 130
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -2,6 +2,7 @@
 Configuración para el organizador de órdenes de compra.
 """
 
+from pathlib import Path
 from typing import List
 
 class Config:
@@ -19,10 +20,54 @@ class Config:
         ("Archivos CSV", "*.csv"),
         ("Todos los archivos", "*.*")
     ]
+    # Extensiones de archivos de datos aceptadas en modo por lotes
+    DATA_FILE_EXTENSIONS = ('.csv', '.xlsx', '.xls')
     # Configuración de directorios
     OUTPUT_FOLDER_NAME = "ordenes_organizadas"
     # Configuración de archivos
     PDF_EXTENSION = ".pdf"
+    # Configuración de rendimiento
+    CHUNK_SIZE = 50_000  # Registros por bloque en modo streaming
+    DEFAULT_WORKERS = 1  # 1 = copia secuencial
+    MAX_INFLIGHT_BYTES = 256 * 1024 * 1024  # Límite de bytes copiándose a la vez
+    DEFAULT_PLACEMENT_MODE = "copy"  # copy, hardlink, reflink, symlink o auto
+    # Manifiesto para ejecuciones incrementales y reanudables
+    USE_MANIFEST = True
+    MANIFEST_FILENAME = ".organizador_manifest.jsonl"
+    MANIFEST_FLUSH_INTERVAL = 200  # Entradas entre escrituras a disco
+    # Informe JSON de tiempos y rendimiento junto a la salida
+    WRITE_METRICS_REPORT = False
+    METRICS_REPORT_FILENAME = "organizador_informe.json"
+    # Caché de registros normalizados
+    USE_RECORD_CACHE = True
+    # Biblioteca de DataFrames: pandas, arrow (pyarrow), polars o auto (la más rápida instalada)
+    DATA_BACKEND = "pandas"
+    CACHE_DIRECTORY = Path.home() / ".cache" / "organizador_ocs"
+    CACHE_MAX_BYTES = 512 * 1024 * 1024
+    # Deduplicación por contenido: cada PDF idéntico se copia una vez y se enlaza
+    USE_DEDUP = False
+    HASH_CACHE_FILENAME = "hashes.json"
+    # Reporte de progreso: console (una línea por archivo), quiet o verbose
+    PROGRESS_MODE = "console"
+    PROGRESS_MAX_UPDATES_PER_SECOND = 10
+    PROGRESS_LOG_FILENAME = "organizador.log"
+    # Reparto en fragmentos para varios procesos o nodos: 'location' o 'directory'
+    SHARD_STRATEGY = "location"
+    # Estadísticas de cada fragmento y resumen combinado de una ejecución repartida entre nodos
+    SHARD_STATS_FILENAME = ".organizador_estadisticas.json"
+    SHARD_REPORT_FILENAME = "organizador_fragmentos.json"
+    # Organización asíncrona: bloques de facturas en cola entre etapas y facturas por bloque
+    ASYNC_QUEUE_SIZE = 8
+    ASYNC_SLICE_SIZE = 256
+    # Hilos de las etapas de lectura y de directorios (la de colocación usa los hilos de copia)
+    ASYNC_LOAD_WORKERS = 1
+    ASYNC_DIRECTORY_WORKERS = 1
+    # Modo de vigilancia: segundos entre sondeos cuando no hay inotify
+    WATCH_POLL_INTERVAL = 0.25
+    # Carpetas mostradas por página en la estructura final (0 = todas)
+    STRUCTURE_PRINT_LIMIT = 200
+    # Nombres limpios memorizados por clean_filename (ubicaciones, solicitantes y proveedores distintos)
+    CLEAN_FILENAME_CACHE_SIZE = 65536
     # Configuración de UI
     UI_MESSAGES = {
         'select_data_file': "1. Selecciona el archivo con los datos (CSV o Excel)...",
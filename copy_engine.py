@@ -0,0 +1,107 @@
+"""
+Motor de copia concurrente para el organizador de órdenes de compra.
+"""
+
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Hashable, List, Optional, Set
+
+
+class CopyEngine:
+    """
+    Ejecuta operaciones de copia en un pool de hilos con memoria acotada.
+
+    Limita tanto el número de tareas pendientes como la cantidad de bytes
+    en vuelo, y nunca ejecuta en paralelo dos tareas con la misma clave
+    (por ejemplo, el mismo archivo de destino).
+    """
+
+    def __init__(self, workers: int, max_inflight_bytes: Optional[int] = None):
+        """
+        Inicializa el motor de copia.
+
+        Args:
+            workers: Número de hilos de trabajo
+            max_inflight_bytes: Máximo de bytes copiándose a la vez
+                (None para no limitar)
+        """
+        self.workers = max(1, workers)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.max_pending = self.workers * 4
+        self._executor = ThreadPoolExecutor(max_workers=self.workers)
+        self._condition = threading.Condition()
+        self._inflight_bytes = 0
+        self._pending = 0
+        self._active_keys: Set[Hashable] = set()
+        self._errors: List[BaseException] = []
+
+    def _can_start(self, size: int, key: Optional[Hashable]) -> bool:
+        if self._pending >= self.max_pending:
+            return False
+        if key is not None and key in self._active_keys:
+            return False
+        if self.max_inflight_bytes is None or self._inflight_bytes == 0:
+            # Un archivo mayor que el límite se copia cuando no hay otros en vuelo
+            return True
+        return self._inflight_bytes + size <= self.max_inflight_bytes
+
+    def submit(self, function: Callable, *args, size: int = 0,
+               key: Optional[Hashable] = None) -> Future:
+        """
+        Envía una tarea al pool, bloqueando mientras no haya capacidad.
+
+        Args:
+            function: Función a ejecutar
+            *args: Argumentos de la función
+            size: Bytes que moverá la tarea
+            key: Clave que no puede ejecutarse en paralelo consigo misma
+
+        Returns:
+            Future de la tarea enviada
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._can_start(size, key))
+            self._pending += 1
+            self._inflight_bytes += size
+            if key is not None:
+                self._active_keys.add(key)
+
+        future = self._executor.submit(function, *args)
+        future.add_done_callback(lambda done: self._release(done, size, key))
+        return future
+
+    def _release(self, future: Future, size: int, key: Optional[Hashable]) -> None:
+        with self._condition:
+            self._pending -= 1
+            self._inflight_bytes -= size
+            if key is not None:
+                self._active_keys.discard(key)
+            if not future.cancelled() and future.exception() is not None:
+                self._errors.append(future.exception())
+            self._condition.notify_all()
+
+    def wait(self) -> None:
+        """
+        Espera a que terminen todas las tareas enviadas.
+
+        Raises:
+            Exception: La primera excepción no controlada de una tarea
+        """
+        with self._condition:
+            self._condition.wait_for(lambda: self._pending == 0)
+            if self._errors:
+                raise self._errors[0]
+
+    def shutdown(self) -> None:
+        """Detiene el pool de hilos."""
+        self._executor.shutdown(wait=True)
+
+    def __enter__(self) -> 'CopyEngine':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback) -> None:
+        try:
+            if exc_type is None:
+                self.wait()
+        finally:
+            self.shutdown()
@@ -3,51 +3,119 @@ Manejo de datos para el organizador de órdenes de compra.
 """
 
 from pathlib import Path
-from typing import Dict, List, Tuple
+from typing import Any, Dict, Iterator, List, Optional, Tuple, Union
 import pandas as pd
 
 from config import Config
+# Las funciones de pandas se reexportan desde aquí por compatibilidad
+from data_backends import (
+    CELL_PARSE_MODE, RECORD_COLUMNS, DataBackend, create_backend, get_excel_engine,
+    normalize_record_columns, normalize_text_series
+)
 from exceptions import DataFileError, MissingColumnsError
-from utils import safe_str_conversion
+from metrics import stage_timer
+from record_cache import RecordCache
+from record_store import RecordStore
+
+
+def record_tuples(columns: pd.DataFrame) -> List[Tuple[str, str, str, str]]:
+    """
+    Convierte registros columnares en tuplas.
+    
+    Args:
+        columns: DataFrame devuelto por normalize_record_columns
+        
+    Returns:
+        Lista de tuplas (ubicación, solicitante, factura, proveedor)
+    """
+    return list(zip(*(columns[column].tolist() for column in RECORD_COLUMNS)))
 
 
 class DataHandler:
     """Maneja la lectura y validación de archivos de datos."""
     
-    def __init__(self, file_path: str):
+    def __init__(self, file_path: str, use_cache: bool = Config.USE_RECORD_CACHE,
+                 backend: str = Config.DATA_BACKEND):
         """
         Inicializa el manejador de datos.
         
         Args:
             file_path: Ruta al archivo de datos
+            use_cache: Si se usa la caché en disco de registros normalizados
+            backend: Biblioteca de DataFrames (ver data_backends)
+            
+        Raises:
+            DataFileError: Si la biblioteca no es válida o no está instalada
         """
         self.file_path = Path(file_path)
-        self.dataframe: pd.DataFrame = None
+        self.backend: DataBackend = create_backend(backend)
+        # DataFrame propio de la biblioteca elegida (pandas, pyarrow.Table o polars)
+        self.dataframe: Any = None
+        self.source_columns: List[str] = None
+        self.cache: Optional[RecordCache] = RecordCache() if use_cache else None
+        self._cached: Optional[Dict] = None
+        self._cache_checked = False
+        self._preview: Optional[Dict] = None
+        # Segundos acumulados por etapa (load, cache_load, record_extraction)
+        self.stage_seconds: Dict[str, float] = {}
         
-    def load_data(self) -> pd.DataFrame:
+    def load_data(self) -> Any:
         """
         Carga los datos del archivo.
         
         Returns:
-            DataFrame con los datos cargados
+            DataFrame con los datos cargados, de la biblioteca elegida
             
         Raises:
             DataFileError: Si hay un error al cargar el archivo
         """
         try:
-            if self.file_path.suffix.lower() == '.csv':
-                self.dataframe = pd.read_csv(self.file_path)
-            elif self.file_path.suffix.lower() in ['.xlsx', '.xls']:
-                self.dataframe = pd.read_excel(self.file_path)
-            else:
-                raise DataFileError(f"Formato de archivo no soportado: {self.file_path.suffix}")
+            with stage_timer(self.stage_seconds, 'load'):
+                if self.file_path.suffix.lower() not in ['.csv', '.xlsx', '.xls']:
+                    raise DataFileError(f"Formato de archivo no soportado: {self.file_path.suffix}")
+                self.dataframe, self.source_columns = self.backend.read(self.file_path)
             
-            print(f"Archivo leído correctamente. Registros encontrados: {len(self.dataframe)}")
+            self._preview = None
+            print(f"Archivo leído correctamente. Registros encontrados: "
+                  f"{self.backend.row_count(self.dataframe)}")
             return self.dataframe
             
         except Exception as e:
             raise DataFileError(f"Error al leer el archivo {self.file_path}: {str(e)}")
     
+    @property
+    def _cache_variant(self) -> str:
+        # Cada biblioteca y modo de lectura tiene su propia entrada en la caché
+        return f"{self.backend.name}-{CELL_PARSE_MODE}"
+    
+    def _load_from_cache(self) -> bool:
+        """
+        Intenta obtener los registros de la caché sin leer el archivo.
+        
+        Returns:
+            True si hay una entrada válida para el archivo actual
+        """
+        if self.cache is None or self.dataframe is not None:
+            return False
+        if not self._cache_checked:
+            self._cache_checked = True
+            with stage_timer(self.stage_seconds, 'cache_load'):
+                self._cached = self.cache.load(self.file_path, self._cache_variant)
+            if self._cached is not None:
+                self.source_columns = self._cached['source_columns']
+                print(f"Registros cargados desde caché: {len(self._cached['records'])}")
+        return self._cached is not None
+    
+    def _store_in_cache(self, records: Union[pd.DataFrame, RecordStore]) -> None:
+        """Guarda los registros normalizados (columnas o RecordStore) y la vista previa en la caché."""
+        if self.cache is None:
+            return
+        self.cache.store(self.file_path, self._cache_variant, {
+            'records': records.astype('category') if isinstance(records, pd.DataFrame) else records,
+            'source_columns': self.source_columns or self.backend.column_names(self.dataframe),
+            'preview': self.get_data_preview(),
+        })
+    
     def validate_columns(self) -> None:
         """
         Valida que el archivo tenga las columnas requeridas.
@@ -55,12 +123,17 @@ class DataHandler:
         Raises:
             MissingColumnsError: Si faltan columnas requeridas
         """
+        if self._load_from_cache():
+            # Solo se guardan en caché archivos con todas las columnas
+            return
+        
         if self.dataframe is None:
             self.load_data()
         
+        present_columns = self.backend.column_names(self.dataframe)
         missing_columns = [
             col for col in Config.REQUIRED_COLUMNS 
-            if col not in self.dataframe.columns
+            if col not in present_columns
         ]
         
         if missing_columns:
@@ -73,39 +146,161 @@ class DataHandler:
         Returns:
             Diccionario con información estadística de los datos
         """
+        if self._load_from_cache():
+            return dict(self._cached['preview'])
+        
         if self.dataframe is None:
             self.load_data()
         
-        return {
-            'total_records': len(self.dataframe),
-            'columns': list(self.dataframe.columns),
-            'unique_requesters': self.dataframe['Nombre del Solicitante'].nunique(),
-            'unique_suppliers': self.dataframe['Name'].nunique(),
-            'unique_locations': self.dataframe['Memo'].nunique() if 'Memo' in self.dataframe.columns else 0
-        }
+        if self._preview is None:
+            present_columns = self.backend.column_names(self.dataframe)
+            present = [
+                column for column in ('Nombre del Solicitante', 'Name', 'Memo')
+                if column in present_columns
+            ]
+            unique_counts = self.backend.unique_counts(self.dataframe, present)
+            self._preview = {
+                'total_records': self.backend.row_count(self.dataframe),
+                'columns': self.source_columns or present_columns,
+                'unique_requesters': int(unique_counts.get('Nombre del Solicitante', 0)),
+                'unique_suppliers': int(unique_counts.get('Name', 0)),
+                'unique_locations': int(unique_counts.get('Memo', 0))
+            }
+        
+        return dict(self._preview)
     
-    def get_processed_records(self) -> List[Tuple[str, str, str, str]]:
+    def get_record_columns(self) -> pd.DataFrame:
         """
-        Obtiene los registros procesados para la organización.
+        Obtiene los registros normalizados en formato columnar.
         
         Returns:
-            Lista de tuplas (ubicación, solicitante, factura, proveedor)
+            DataFrame con las columnas Memo, Nombre del Solicitante, Factura
+            y Name ya convertidas a texto
         """
+        if self._load_from_cache():
+            records = self._cached['records']
+            if isinstance(records, RecordStore):
+                return records.to_frame(RECORD_COLUMNS)
+            return records
+        
         if self.dataframe is None:
             self.load_data()
         
         self.validate_columns()
         
-        records = []
-        for _, row in self.dataframe.iterrows():
-            ubicacion = safe_str_conversion(row['Memo'])
-            solicitante = safe_str_conversion(row['Nombre del Solicitante'])
-            factura = safe_str_conversion(row['Factura'])
-            proveedor = safe_str_conversion(row['Name'])
+        with stage_timer(self.stage_seconds, 'record_extraction'):
+            columns = self.backend.record_columns(self.dataframe)
+        self._store_in_cache(columns)
+        return columns
+    
+    def get_record_store(self) -> RecordStore:
+        """
+        Obtiene los registros procesados en formato compacto.
+        
+        Ocupa mucha menos memoria que get_processed_records con archivos
+        grandes: las tuplas se crean solo al iterar (ver record_store).
+        
+        Returns:
+            RecordStore con los registros en el orden del archivo
+        """
+        if self._load_from_cache():
+            records = self._cached['records']
+            if isinstance(records, RecordStore):
+                return records
+            with stage_timer(self.stage_seconds, 'record_store'):
+                return RecordStore.from_columns(*(records[column] for column in RECORD_COLUMNS))
+        
+        if self.dataframe is None:
+            self.load_data()
+        
+        self.validate_columns()
+        
+        with stage_timer(self.stage_seconds, 'record_extraction'):
+            store = self.backend.record_store(self.dataframe)
+        self._store_in_cache(store)
+        return store
+    
+    def get_processed_records(self) -> List[Tuple[str, str, str, str]]:
+        """
+        Obtiene los registros procesados para la organización.
+        
+        Returns:
+            Lista de tuplas (ubicación, solicitante, factura, proveedor)
+        """
+        return record_tuples(self.get_record_columns())
+    
+    def _validate_csv_header(self) -> None:
+        """
+        Valida las columnas de un CSV leyendo solo su encabezado.
+        
+        Raises:
+            MissingColumnsError: Si faltan columnas requeridas
+        """
+        try:
+            header = pd.read_csv(self.file_path, nrows=0).columns
+        except Exception as e:
+            raise DataFileError(f"Error al leer el archivo {self.file_path}: {str(e)}")
+        
+        missing_columns = [col for col in Config.REQUIRED_COLUMNS if col not in header]
+        if missing_columns:
+            raise MissingColumnsError(missing_columns)
+    
+    def iter_record_chunks(self, chunk_size: int = Config.CHUNK_SIZE) -> Iterator[pd.DataFrame]:
+        """
+        Lee los registros normalizados por bloques de tamaño acotado.
+        
+        Los CSV se leen en streaming, solo con las columnas requeridas y
+        como texto, por lo que el consumo de memoria no depende del tamaño
+        del archivo. Otros formatos se cargan completos y se entregan en
+        bloques.
+        
+        Args:
+            chunk_size: Número máximo de registros por bloque
+            
+        Yields:
+            DataFrames con las columnas de registro normalizadas
             
-            records.append((ubicacion, solicitante, factura, proveedor))
+        Raises:
+            DataFileError: Si hay un error al leer el archivo
+            MissingColumnsError: Si faltan columnas requeridas
+        """
+        if (self.file_path.suffix.lower() != '.csv' or self.dataframe is not None
+                or self._load_from_cache()):
+            columns = self.get_record_columns()
+            for start in range(0, len(columns), chunk_size):
+                yield columns.iloc[start:start + chunk_size]
+            return
         
-        return records
+        self._validate_csv_header()
+        try:
+            reader = pd.read_csv(
+                self.file_path,
+                usecols=Config.REQUIRED_COLUMNS,
+                dtype=str,
+                chunksize=chunk_size
+            )
+            with reader:
+                for chunk in reader:
+                    with stage_timer(self.stage_seconds, 'record_extraction'):
+                        columns = normalize_record_columns(chunk)
+                    yield columns
+        except (DataFileError, GeneratorExit):
+            raise
+        except Exception as e:
+            raise DataFileError(f"Error al leer el archivo {self.file_path}: {str(e)}")
+    
+    def iter_records(self, chunk_size: int = Config.CHUNK_SIZE) -> Iterator[Tuple[str, str, str, str]]:
+        """
+        Itera perezosamente los registros procesados.
+        
+        Args:
+            chunk_size: Número de registros leídos del archivo a la vez
+            
+        Yields:
+            Tuplas (ubicación, solicitante, factura, proveedor)
+        """
+        for chunk in self.iter_record_chunks(chunk_size):
+            yield from record_tuples(chunk)
     
     def print_preview(self) -> None:
         """Imprime una vista previa de los datos."""
@@ -0,0 +1,222 @@
+"""
+Deduplicación por contenido de los PDFs de origen.
+
+Muchos PDFs son idénticos byte a byte aunque tengan distinto nombre de
+factura (reemisiones, escaneos duplicados). Con la deduplicación activa,
+cada contenido se copia una sola vez y las siguientes apariciones se
+colocan como enlaces duros a esa primera copia.
+
+El hash se calcula al colocar cada archivo, de modo que solo se leen los
+PDFs que los datos referencian, y solo si su tamaño coincide con el de otro
+archivo (un tamaño único no puede tener duplicados). Los hashes se guardan
+en caché por (ruta, tamaño, fecha de modificación) para no volver a leer
+los archivos en ejecuciones siguientes.
+"""
+
+import json
+import threading
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import Config
+from pdf_index import PDFEntry
+from placement import FilePlacer
+from record_cache import _write_atomic, hash_file_content
+
+
+class HashCache:
+    """Caché en disco de hashes de contenido, válida mientras no cambien tamaño ni fecha."""
+
+    def __init__(self, path: Optional[Path] = None):
+        """
+        Inicializa la caché.
+
+        Args:
+            path: Archivo de la caché (por defecto, dentro de Config.CACHE_DIRECTORY)
+        """
+        self.path = Path(path or Config.CACHE_DIRECTORY / Config.HASH_CACHE_FILENAME)
+        self._hashes: Dict[str, List] = {}
+        self._lock = threading.Lock()
+        self._dirty = False
+
+    def load(self) -> 'HashCache':
+        """Lee la caché desde disco; un archivo ausente o dañado equivale a una caché vacía."""
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                self._hashes = json.load(f)
+        except (OSError, ValueError):
+            self._hashes = {}
+        return self
+
+    def get(self, entry: PDFEntry) -> Optional[str]:
+        """
+        Devuelve el hash guardado de un archivo si sigue siendo válido.
+
+        Args:
+            entry: Entrada del índice de PDFs
+
+        Returns:
+            Hash del contenido, o None si no está o el archivo cambió
+        """
+        cached = self._hashes.get(str(entry.path))
+        if cached is not None and cached[0] == entry.size and cached[1] == entry.mtime:
+            return cached[2]
+        return None
+
+    def put(self, entry: PDFEntry, digest: str) -> None:
+        """
+        Guarda el hash de un archivo.
+
+        Args:
+            entry: Entrada del índice de PDFs
+            digest: Hash del contenido
+        """
+        with self._lock:
+            self._hashes[str(entry.path)] = [entry.size, entry.mtime, digest]
+            self._dirty = True
+
+    def save(self) -> None:
+        """Escribe la caché si hubo cambios. Los errores se ignoran: la caché es opcional."""
+        if not self._dirty:
+            return
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            _write_atomic(self.path, json.dumps(self._hashes).encode('utf-8'))
+            self._dirty = False
+        except OSError:
+            pass
+
+
+class _StoredContent:
+    """Primera copia de un contenido dentro de la ejecución."""
+
+    def __init__(self, destination: Path):
+        self.destination = destination
+        self.mode: Optional[str] = None
+        self.placed = threading.Event()
+
+
+class ContentStore:
+    """
+    Coloca los PDFs guardando cada contenido una sola vez.
+
+    La primera aparición de un contenido se coloca con el FilePlacer
+    configurado; las siguientes se enlazan a ella. Es seguro usarlo desde
+    varios hilos de copia: si otro hilo está colocando la primera copia, se
+    espera a que termine antes de enlazar.
+    """
+
+    def __init__(self, shared_sizes: Set[int], hash_cache: Optional[HashCache] = None):
+        """
+        Inicializa el almacén.
+
+        Args:
+            shared_sizes: Tamaños que tienen más de un archivo en el directorio de PDFs
+            hash_cache: Caché de hashes de ejecuciones anteriores
+        """
+        self.shared_sizes = shared_sizes
+        self.hash_cache = hash_cache
+        # Hashes calculados durante la ejecución, por nombre de archivo
+        self.digests: Dict[str, Optional[str]] = {}
+        self._stored: Dict[str, _StoredContent] = {}
+        self._lock = threading.Lock()
+        self._linker = FilePlacer('hardlink')
+
+    @classmethod
+    def build(cls, entries: Iterable[PDFEntry], hash_cache: Optional[HashCache] = None) -> 'ContentStore':
+        """
+        Construye el almacén a partir de los tamaños del índice, sin leer ningún archivo.
+
+        Args:
+            entries: Entradas del índice de PDFs
+            hash_cache: Caché de hashes (se guarda con save())
+
+        Returns:
+            Almacén listo para colocar archivos
+        """
+        sizes = Counter(entry.size for entry in entries)
+        return cls({size for size, count in sizes.items() if count > 1}, hash_cache)
+
+    def digest(self, entry: PDFEntry) -> Optional[str]:
+        """
+        Obtiene la huella del contenido de un PDF, calculándola la primera vez.
+
+        Args:
+            entry: Entrada del índice de PDFs
+
+        Returns:
+            Hash del contenido más el tamaño, o None si el archivo no puede
+            tener duplicados o no se pudo leer
+        """
+        if entry.size not in self.shared_sizes:
+            return None
+        with self._lock:
+            if entry.name in self.digests:
+                return self.digests[entry.name]
+        digest = self.hash_cache.get(entry) if self.hash_cache is not None else None
+        if digest is None:
+            try:
+                digest = hash_file_content(entry.path)
+            except OSError:
+                digest = None
+            if digest is not None and self.hash_cache is not None:
+                self.hash_cache.put(entry, digest)
+        # El tamaño forma parte de la clave como protección adicional ante colisiones
+        fingerprint = f"{digest}:{entry.size}" if digest is not None else None
+        with self._lock:
+            return self.digests.setdefault(entry.name, fingerprint)
+
+    def save(self) -> None:
+        """Guarda en disco los hashes calculados durante la ejecución."""
+        if self.hash_cache is not None:
+            self.hash_cache.save()
+
+    def place(self, placer: FilePlacer, entry: PDFEntry, destination: Path) -> Tuple[str, bool]:
+        """
+        Coloca un PDF, enlazándolo a una copia anterior si tiene el mismo contenido.
+
+        Args:
+            placer: Colocador usado para la primera copia de cada contenido
+            entry: PDF de origen
+            destination: Ruta de destino
+
+        Returns:
+            (modo usado, True si se evitó copiar los bytes)
+
+        Raises:
+            OSError: Si no se pudo colocar el archivo
+        """
+        digest = self.digest(entry)
+        if digest is None:
+            return placer.place(entry.path, destination), False
+
+        while True:
+            with self._lock:
+                stored = self._stored.get(digest)
+                owner = stored is None
+                if owner:
+                    stored = self._stored[digest] = _StoredContent(destination)
+
+            if owner:
+                try:
+                    stored.mode = placer.place(entry.path, destination)
+                except BaseException:
+                    with self._lock:
+                        del self._stored[digest]
+                    raise
+                finally:
+                    stored.placed.set()
+                return stored.mode, False
+
+            stored.placed.wait()
+            if stored.mode is None:
+                continue  # La primera copia falló: este archivo ocupa su lugar
+            if stored.mode != 'copy' or stored.destination == destination:
+                # Enlaces y clones ya no duplican los bytes del origen
+                return placer.place(entry.path, destination), False
+            try:
+                self._linker.place(stored.destination, destination)
+                return 'dedup', True
+            except OSError:
+                return placer.place(entry.path, destination), False
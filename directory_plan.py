@@ -0,0 +1,193 @@
+"""
+Planificación de la estructura de directorios de salida.
+"""
+
+import os
+import threading
+from pathlib import Path
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import Config
+from utils import clean_filename
+
+
+class DirectoryPlan:
+    """
+    Conjunto de directorios de destino de una organización.
+
+    Primero se registran todas las combinaciones ubicación/solicitante/
+    proveedor (sin tocar el disco) y después se crean los directorios
+    únicos en una sola pasada, padres antes que hijos. Los directorios ya
+    creados se recuerdan en memoria para no volver a consultarlos.
+
+    Durante la colocación se cuentan los archivos de cada proveedor, de modo
+    que la estructura resultante puede mostrarse sin recorrer el disco. Para
+    saber si un archivo de una ejecución anterior sigue en su sitio, cada
+    directorio de proveedor que ya existía se lee una sola vez (has_file).
+    """
+
+    def __init__(self, output_directory: Path):
+        """
+        Inicializa el plan.
+
+        Args:
+            output_directory: Directorio raíz de la estructura
+        """
+        self.output_directory = Path(output_directory)
+        self._destinations: Dict[Tuple[str, str, str], Path] = {}
+        self._planned: Set[Tuple[str, ...]] = set()
+        self._created: Set[Tuple[str, ...]] = set()
+        self._parts_by_destination: Dict[Path, Tuple[str, ...]] = {}
+        self._files: Dict[Tuple[str, ...], Set[str]] = {}
+        # Archivos encontrados en disco por directorio de proveedor, leídos bajo demanda
+        self._on_disk: Dict[Tuple[str, ...], Set[str]] = {}
+        self._counts_lock = threading.Lock()
+
+    def add(self, location: str, requester: str, supplier: str) -> Path:
+        """
+        Registra el destino de un registro.
+
+        Args:
+            location: Ubicación del registro
+            requester: Solicitante del registro
+            supplier: Proveedor del registro
+
+        Returns:
+            Ruta del directorio final donde debe ir el PDF
+        """
+        key = (location, requester, supplier)
+        destination = self._destinations.get(key)
+        if destination is None:
+            parts = (clean_filename(location), clean_filename(requester), clean_filename(supplier))
+            destination = self.output_directory.joinpath(*parts)
+            self._destinations[key] = destination
+            self._parts_by_destination[destination] = parts
+            for depth in range(1, len(parts) + 1):
+                self._planned.add(parts[:depth])
+        return destination
+
+    def add_records(self, records: Iterable[Tuple[str, str, str, str]]) -> List[Path]:
+        """
+        Registra los destinos de varios registros.
+
+        Args:
+            records: Tuplas (ubicación, solicitante, factura, proveedor)
+
+        Returns:
+            Lista de directorios de destino, en el mismo orden que los registros
+        """
+        return [self.add(location, requester, supplier)
+                for location, requester, _, supplier in records]
+
+    def __len__(self) -> int:
+        return len(self._planned)
+
+    @property
+    def pending(self) -> List[Tuple[str, ...]]:
+        """Directorios planificados que aún no se han creado, padres primero."""
+        return sorted(self._planned - self._created)
+
+    def create(self, on_created: Optional[Callable[[Tuple[str, ...]], None]] = None) -> int:
+        """
+        Crea en disco los directorios pendientes.
+
+        Args:
+            on_created: Función llamada con las partes de cada directorio nuevo
+
+        Returns:
+            Número de directorios que no existían y fueron creados
+        """
+        created = 0
+        for parts in self.pending:
+            try:
+                self.output_directory.joinpath(*parts).mkdir()
+                created += 1
+                if len(parts) == 3:
+                    # Un directorio recién creado está vacío: no hace falta leerlo
+                    with self._counts_lock:
+                        self._on_disk.setdefault(parts, set())
+                if on_created is not None:
+                    on_created(parts)
+            except FileExistsError:
+                pass
+            self._created.add(parts)
+        return created
+
+    def count_file(self, destination: Path, filename: str) -> None:
+        """
+        Registra un archivo presente en un directorio de proveedor del plan.
+
+        Un mismo archivo registrado varias veces se cuenta una sola vez.
+        Puede llamarse desde varios hilos de copia a la vez.
+
+        Args:
+            destination: Directorio devuelto por add()
+            filename: Nombre del archivo dentro del directorio
+        """
+        parts = self._parts_by_destination[destination]
+        with self._counts_lock:
+            self._files.setdefault(parts, set()).add(filename)
+
+    def has_file(self, destination: Path, filename: str) -> bool:
+        """
+        Indica si un archivo está en un directorio de proveedor del plan.
+
+        Cuenta los archivos registrados con count_file y los que ya había en
+        disco; cada directorio se lee como máximo una vez por ejecución.
+
+        Args:
+            destination: Directorio devuelto por add()
+            filename: Nombre del archivo dentro del directorio
+
+        Returns:
+            True si el archivo existe
+        """
+        parts = self._parts_by_destination[destination]
+        with self._counts_lock:
+            if filename in self._files.get(parts, ()):
+                return True
+            names = self._on_disk.get(parts)
+        if names is None:
+            try:
+                with os.scandir(destination) as entries:
+                    names = {entry.name for entry in entries if entry.is_file()}
+            except OSError:
+                names = set()
+            with self._counts_lock:
+                names = self._on_disk.setdefault(parts, names)
+        return filename in names
+
+    def entries(self) -> List[Tuple[Tuple[str, ...], Optional[int]]]:
+        """
+        Directorios del plan en orden de recorrido (cada padre antes que sus hijos).
+
+        Returns:
+            Lista de (partes, archivos); archivos es None salvo en los
+            directorios de proveedor
+        """
+        return [(parts, len(self._files.get(parts, ())) if len(parts) == 3 else None)
+                for parts in sorted(self._planned)]
+
+    def audit(self) -> List[Tuple[Tuple[str, ...], int, int]]:
+        """
+        Compara los archivos contados con los que hay realmente en disco.
+
+        Recorre cada directorio de proveedor del plan, así que su costo es
+        el de volver a leer toda la estructura: es una comprobación opcional.
+
+        Returns:
+            Lista de (partes, esperados, encontrados) de los directorios que no coinciden
+        """
+        mismatches = []
+        for parts, expected in self.entries():
+            if expected is None:
+                continue
+            try:
+                with os.scandir(self.output_directory.joinpath(*parts)) as entries:
+                    found = sum(1 for entry in entries
+                                if entry.name.endswith(Config.PDF_EXTENSION) and entry.is_file())
+            except FileNotFoundError:
+                found = 0
+            if found != expected:
+                mismatches.append((parts, expected, found))
+        return mismatches
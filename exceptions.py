@@ -31,6 +31,15 @@ class OutputDirectoryError(FileOrganizerError):
     pass
 
 
+class PlacementModeError(FileOrganizerError):
+    """Error cuando se solicita un modo de colocación de archivos no válido."""
+    
+    def __init__(self, mode, valid_modes):
+        self.mode = mode
+        self.valid_modes = valid_modes
+        super().__init__(f"Modo de colocación no válido: {mode}. Opciones: {', '.join(valid_modes)}")
+
+
 class UserCancellationError(FileOrganizerError):
     """Error cuando el usuario cancela la operación."""
     pass
\ No newline at end of file
@@ -2,15 +2,32 @@
 Organizador principal de archivos PDF.
 """
 
-import shutil
+import asyncio
+import json
+import math
+import os
+import threading
+import time
+from contextlib import nullcontext
+from itertools import islice
 from pathlib import Path
-from typing import NamedTuple, List
-from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, NamedTuple, List, Optional, Tuple, Union
+from dataclasses import asdict, dataclass, field, fields
 
+from async_pipeline import AsyncPipeline
 from config import Config
-from data_handler import DataHandler
+from copy_engine import CopyEngine
+from data_handler import DataHandler, record_tuples
+from dedup import ContentStore, HashCache
+from directory_plan import DirectoryPlan
 from exceptions import PDFDirectoryError, OutputDirectoryError
-from utils import clean_filename, ensure_directory_exists, count_pdf_files
+from manifest import RunManifest
+from metrics import RunMetrics
+from pdf_index import PDFEntry, PDFIndex
+from placement import FilePlacer
+from progress import ConsoleReporter, ProgressEvent, ProgressReporter
+from sharding import shard_file_path, shard_of
+from utils import ensure_directory_exists
 
 @dataclass
 class OrganizationStats:
@@ -18,7 +35,25 @@ class OrganizationStats:
     folders_created: int = 0
     files_moved: int = 0
     files_not_found: int = 0
+    files_skipped: int = 0
+    bytes_copied: int = 0
+    bytes_saved: int = 0
     total_records: int = 0
+    unmatched_pdfs: int = 0
+    placement_modes: Dict[str, int] = field(default_factory=dict)
+    @classmethod
+    def combine(cls, stats_list: Iterable['OrganizationStats']) -> 'OrganizationStats':
+        combined = cls()
+        for stats in stats_list:
+            for stats_field in fields(cls):
+                value = getattr(stats, stats_field.name)
+                if isinstance(value, dict):
+                    target = getattr(combined, stats_field.name)
+                    for key, count in value.items():
+                        target[key] = target.get(key, 0) + count
+                else:
+                    setattr(combined, stats_field.name, getattr(combined, stats_field.name) + value)
+        return combined
 
 class PDFRecord(NamedTuple):
     """Representa un registro de PDF a organizar."""
@@ -29,12 +64,61 @@ class PDFRecord(NamedTuple):
 
 class FileOrganizer:
     """Organizador principal de archivos PDF."""
-    def __init__(self, data_file_path: str, pdf_directory: str, output_directory: str):
-        self.data_handler = DataHandler(data_file_path)
+    def __init__(self, data_source: Union[str, DataHandler, Iterable[Tuple[str, str, str, str]]],
+                 pdf_directory: str, output_directory: str,
+                 workers: int = Config.DEFAULT_WORKERS,
+                 max_inflight_bytes: Optional[int] = Config.MAX_INFLIGHT_BYTES,
+                 placement_mode: str = Config.DEFAULT_PLACEMENT_MODE,
+                 use_manifest: bool = Config.USE_MANIFEST,
+                 streaming: bool = False, chunk_size: int = Config.CHUNK_SIZE,
+                 write_report: bool = Config.WRITE_METRICS_REPORT,
+                 progress: Optional[ProgressReporter] = None,
+                 dedup: bool = Config.USE_DEDUP,
+                 shard: Optional[Tuple[int, int]] = None, shard_by: str = Config.SHARD_STRATEGY):
+        # Admite una ruta, un DataHandler ya cargado o una fuente de registros
+        self.record_source: Optional[Iterable[Tuple[str, str, str, str]]] = None
+        if isinstance(data_source, DataHandler):
+            self.data_handler = data_source
+        elif isinstance(data_source, (str, os.PathLike)):
+            self.data_handler = DataHandler(data_source)
+        else:
+            self.data_handler = None
+            self.record_source = data_source
         self.pdf_directory = Path(pdf_directory)
         self.output_directory = Path(output_directory)
+        self.workers = max(1, workers)
+        self.max_inflight_bytes = max_inflight_bytes
+        self.placer = FilePlacer(placement_mode)
+        self._link_placer = FilePlacer('hardlink')
+        self._copy_placer = FilePlacer('copy')
+        self.use_manifest = use_manifest
+        self.streaming = streaming
+        self.chunk_size = chunk_size
+        self.write_report = write_report
+        self.progress = progress if progress is not None else ConsoleReporter()
+        self.dedup = dedup
+        # (índice, total): procesar solo los registros de un fragmento (ver sharding)
+        self.shard = shard
+        self.shard_by = shard_by
         self.stats = OrganizationStats()
+        self.metrics = RunMetrics()
+        self.pdf_index: PDFIndex = None
+        self.manifest: Optional[RunManifest] = None
+        self.content_store: Optional[ContentStore] = None
+        self.directory_plan = DirectoryPlan(self.output_directory)
+        self._stats_lock = threading.Lock()
         self._validate_directories()
+    def _count(self, field_name: str, amount: int = 1) -> None:
+        with self._stats_lock:
+            setattr(self.stats, field_name, getattr(self.stats, field_name) + amount)
+    def _count_placement(self, mode: str, size: int, deduplicated: bool = False) -> None:
+        with self._stats_lock:
+            self.stats.files_moved += 1
+            if mode == 'copy':
+                self.stats.bytes_copied += size
+            if deduplicated:
+                self.stats.bytes_saved += size
+            self.stats.placement_modes[mode] = self.stats.placement_modes.get(mode, 0) + 1
     def _validate_directories(self) -> None:
         if not self.pdf_directory.exists():
             raise PDFDirectoryError(f"El directorio de PDFs no existe: {self.pdf_directory}")
@@ -44,71 +128,282 @@ class FileOrganizer:
             ensure_directory_exists(self.output_directory)
         except Exception as e:
             raise OutputDirectoryError(f"No se pudo crear el directorio de salida: {e}")
-    def _create_directory_structure(self, record: PDFRecord) -> Path:
-        location = clean_filename(record.location)
-        requester = clean_filename(record.requester)
-        supplier = clean_filename(record.supplier)
-        location_path = self.output_directory / location
-        requester_path = location_path / requester
-        supplier_path = requester_path / supplier
-        for path, name in [
-            (location_path, f"📁 {location}"),
-            (requester_path, f"  📁 {location}/{requester}"),
-            (supplier_path, f"    📁 {location}/{requester}/{supplier}")
-        ]:
-            if not path.exists():
-                ensure_directory_exists(path)
-                print(f"Carpeta creada: {name}")
-                self.stats.folders_created += 1
-        return supplier_path
-    def _copy_pdf_file(self, record: PDFRecord, destination_path: Path) -> bool:
+    def _report_folder_created(self, parts) -> None:
+        self.progress.emit(ProgressEvent('folder_created', '/'.join(parts)))
+        self._count('folders_created')
+    def plan_directories(self, records_data) -> List[Path]:
+        return self.directory_plan.add_records(records_data)
+    def _place_from_source(self, source_entry: PDFEntry, destination_pdf: Path) -> Tuple[str, bool]:
+        if self.content_store is not None:
+            return self.content_store.place(self.placer, source_entry, destination_pdf)
+        return self.placer.place(source_entry.path, destination_pdf), False
+    def _place_fan_out(self, source_entry: PDFEntry, destination_pdf: Path,
+                       first_copy: Tuple[Path, str]) -> Tuple[str, bool]:
+        # Las demás apariciones de una factura salen de su primera copia: el origen se lee una sola vez
+        first_pdf, first_mode = first_copy
+        if first_mode != 'copy':
+            return self._place_from_source(source_entry, destination_pdf)
+        if destination_pdf == first_pdf:
+            return first_mode, False
+        if self.content_store is not None:
+            try:
+                self._link_placer.place(first_pdf, destination_pdf)
+                return 'dedup', True
+            except OSError:
+                pass
+        # Copia atómica: el destino anterior puede ser un enlace compartido con otras salidas
+        return self._copy_placer.place(first_pdf, destination_pdf), False
+    def _copy_pdf_file(self, record: PDFRecord, destination_path: Path, source_entry: Optional[PDFEntry],
+                       first_copy: Optional[Tuple[Path, str]] = None) -> Optional[str]:
         pdf_filename = f"{record.invoice}{Config.PDF_EXTENSION}"
-        source_pdf = self.pdf_directory / pdf_filename
         destination_pdf = destination_path / pdf_filename
-        if source_pdf.exists():
+        if source_entry is not None:
             try:
-                shutil.copy2(source_pdf, destination_pdf)
-                location_clean = clean_filename(record.location)
-                requester_clean = clean_filename(record.requester)
-                supplier_clean = clean_filename(record.supplier)
-                print(f"      📄 Archivo copiado: {pdf_filename} -> "
-                      f"{location_clean}/{requester_clean}/{supplier_clean}/")
-                self.stats.files_moved += 1
-                return True
+                start = time.perf_counter()
+                if first_copy is not None:
+                    used_mode, deduplicated = self._place_fan_out(source_entry, destination_pdf, first_copy)
+                else:
+                    used_mode, deduplicated = self._place_from_source(source_entry, destination_pdf)
+                self.metrics.copy_latency.record(time.perf_counter() - start)
+                self.progress.emit(ProgressEvent('file_placed', pdf_filename, destination_path, used_mode))
+                self._count_placement(used_mode, source_entry.size, deduplicated)
+                self.directory_plan.count_file(destination_path, pdf_filename)
+                if self.manifest is not None:
+                    self.manifest.record(self._manifest_key(destination_pdf), source_entry, used_mode)
+                return used_mode
             except Exception as e:
-                print(f"      ❌ Error al copiar {pdf_filename}: {str(e)}")
-                return False
+                self.progress.emit(ProgressEvent('file_error', pdf_filename, destination_path, error=str(e)))
+                return None
         else:
-            print(f"      ❓ Archivo no encontrado: {pdf_filename}")
-            self.stats.files_not_found += 1
-            return False
-    def organize_files(self) -> OrganizationStats:
+            self.progress.emit(ProgressEvent('file_not_found', pdf_filename, destination_path))
+            self._count('files_not_found')
+            return None
+    def _copy_invoice(self, targets: List[Tuple[PDFRecord, Path]], source_entry: Optional[PDFEntry]) -> None:
+        first_copy = None
+        for record, destination_path in targets:
+            used_mode = self._copy_pdf_file(record, destination_path, source_entry, first_copy)
+            if first_copy is None and used_mode is not None:
+                first_copy = (destination_path / f"{record.invoice}{Config.PDF_EXTENSION}", used_mode)
+    def _manifest_key(self, destination_pdf: Path) -> str:
+        return destination_pdf.relative_to(self.output_directory).as_posix()
+    def _pending_targets(self, targets: List[Tuple[PDFRecord, Path]],
+                         source_entry: Optional[PDFEntry]) -> List[Tuple[PDFRecord, Path]]:
+        pending = []
+        for record, destination_path in targets:
+            destination_pdf = destination_path / f"{record.invoice}{Config.PDF_EXTENSION}"
+            # El manifiesto no basta: el archivo pudo borrarse de la salida después
+            if (source_entry is not None and self.manifest is not None
+                    and self.manifest.is_up_to_date(self._manifest_key(destination_pdf), source_entry)
+                    and self.directory_plan.has_file(destination_path, destination_pdf.name)):
+                self._count('files_skipped')
+                self.directory_plan.count_file(destination_path, destination_pdf.name)
+                self.progress.emit(ProgressEvent('file_skipped', destination_pdf.name, destination_path))
+            else:
+                pending.append((record, destination_path))
+        return pending
+    def _process_invoice(self, invoice: str, targets: List[Tuple[PDFRecord, Path]],
+                         engine: Optional[CopyEngine]) -> None:
+        source_entry = self.pdf_index.lookup(invoice)
+        pending = self._pending_targets(targets, source_entry)
+        if not pending:
+            return
+        if engine is None:
+            self._copy_invoice(pending, source_entry)
+        else:
+            # Una tarea por factura; la clave evita escribir a la vez sus mismos destinos desde otro bloque
+            engine.submit(self._copy_invoice, pending, source_entry,
+                          size=source_entry.size if source_entry else 0, key=invoice)
+    def _record_batches(self) -> Iterator[List[Tuple[str, str, str, str]]]:
+        if self.shard is None:
+            yield from self._read_record_batches()
+            return
+        shard_index, shard_count = self.shard
+        for batch in self._read_record_batches():
+            yield [record for record in batch if shard_of(record, shard_count, self.shard_by) == shard_index]
+    def iter_records(self) -> Iterator[Tuple[str, str, str, str]]:
+        # Misma fuente y formato que organize_files (streaming o no, con fragmento)
+        for batch in self._record_batches():
+            yield from batch
+    def _read_record_batches(self) -> Iterator[List[Tuple[str, str, str, str]]]:
+        if self.record_source is not None:
+            records = iter(self.record_source)
+            for batch in iter(lambda: list(islice(records, self.chunk_size)), []):
+                yield batch
+        elif self.streaming:
+            for chunk in self.data_handler.iter_record_chunks(self.chunk_size):
+                yield record_tuples(chunk)
+        else:
+            # Los registros quedan en formato compacto y se materializan bloque a bloque
+            yield from self.data_handler.get_record_store().batches(self.chunk_size)
+    def process_batch(self, records_data, engine: Optional[CopyEngine]) -> None:
+        self.stats.total_records += len(records_data)
+        self.progress.records_loaded(len(records_data))
+        self.place_batch(records_data, engine)
+    def place_batch(self, records_data, engine: Optional[CopyEngine]) -> None:
+        # Coloca registros sin contarlos como procesados (el modo vigilancia repite registros ya contados)
+        # Las carpetas del bloque se planifican y crean antes de colocar archivos
+        with self.metrics.stage('directory_planning'):
+            destinations = self.plan_directories(records_data)
+        with self.metrics.stage('directory_creation'):
+            self.directory_plan.create(self._report_folder_created)
+        with self.metrics.stage('placement'):
+            # Agrupar por factura permite leer cada PDF de origen una sola vez
+            invoices: Dict[str, List[Tuple[PDFRecord, Path]]] = {}
+            for (location, requester, invoice, supplier), destination_path in zip(records_data, destinations):
+                invoices.setdefault(invoice, []).append(
+                    (PDFRecord(location, requester, invoice, supplier), destination_path))
+            for invoice, targets in invoices.items():
+                self._process_invoice(invoice, targets, engine)
+    def process_records(self, engine: Optional[CopyEngine] = None,
+                        on_batch: Optional[Callable[[List[Tuple[str, str, str, str]]], None]] = None) -> None:
+        batches = self._record_batches()
+        while True:
+            with self.metrics.stage('record_loading'):
+                records_data = next(batches, None)
+            if records_data is None:
+                break
+            if on_batch is not None:
+                on_batch(records_data)
+            self.process_batch(records_data, engine)
+    def _prepare_run(self) -> None:
+        # El índice y el manifiesto ya asignados (p. ej. por ShardedOrganizer) se reutilizan
+        if self.pdf_index is None:
+            with self.metrics.stage('pdf_index'):
+                self.pdf_index = PDFIndex.build(self.pdf_directory)
+        if self.dedup:
+            with self.metrics.stage('content_hashing'):
+                self.content_store = ContentStore.build(self.pdf_index, HashCache().load())
+        if self.manifest is None and self.use_manifest:
+            with self.metrics.stage('manifest_load'):
+                self.manifest = RunManifest(self.output_directory, self.shard).load()
+    def _finish_run(self) -> None:
+        if self.content_store is not None:
+            self.content_store.save()
+        if self.manifest is not None:
+            self.manifest.close()
+        self.progress.finish()
+    def organize_files(self, on_batch: Optional[Callable[[List[Tuple[str, str, str, str]]], None]] = None
+                       ) -> OrganizationStats:
+        # on_batch recibe cada bloque de registros leído (ver WatchOrganizer)
         print("=== INICIANDO ORGANIZACIÓN ===")
-        records_data = self.data_handler.get_processed_records()
-        self.stats.total_records = len(records_data)
-        for location, requester, invoice, supplier in records_data:
-            record = PDFRecord(location, requester, invoice, supplier)
-            destination_path = self._create_directory_structure(record)
-            self._copy_pdf_file(record, destination_path)
+        self.progress.start(self.output_directory)
+        with self.metrics.stage('total'):
+            self._prepare_run()
+            engine = CopyEngine(self.workers, self.max_inflight_bytes) if self.workers > 1 else None
+            try:
+                # En modo streaming los bloques se leen mientras el pool sigue copiando
+                with engine or nullcontext():
+                    self.process_records(engine, on_batch)
+                    drain_start = time.perf_counter()
+                self.metrics.stage_seconds['pool_drain'] = time.perf_counter() - drain_start
+            finally:
+                self._finish_run()
+            self.stats.unmatched_pdfs = len(self.pdf_index.unmatched())
+        if self.write_report:
+            self.save_report()
         return self.stats
+    async def organize_files_async(self, placement_workers: Optional[int] = None,
+                                   queue_size: int = Config.ASYNC_QUEUE_SIZE,
+                                   load_workers: int = Config.ASYNC_LOAD_WORKERS,
+                                   directory_workers: int = Config.ASYNC_DIRECTORY_WORKERS) -> OrganizationStats:
+        # Misma organización que organize_files, sin bloquear el bucle de eventos (ver async_pipeline)
+        print("=== INICIANDO ORGANIZACIÓN ===")
+        self.progress.start(self.output_directory)
+        loop = asyncio.get_running_loop()
+        with self.metrics.stage('total'):
+            await loop.run_in_executor(None, self._prepare_run)
+            try:
+                with self.metrics.stage('placement'):
+                    await AsyncPipeline(self, placement_workers or self.workers, queue_size,
+                                        load_workers=load_workers, directory_workers=directory_workers).run()
+            finally:
+                await loop.run_in_executor(None, self._finish_run)
+            self.stats.unmatched_pdfs = len(self.pdf_index.unmatched())
+        if self.write_report:
+            await loop.run_in_executor(None, self.save_report)
+        return self.stats
+    def _data_stage_report(self) -> Dict:
+        if self.data_handler is None:
+            return {}
+        return {'data_stage_seconds': dict(self.data_handler.stage_seconds)}
+    def get_report(self) -> Dict:
+        report = self.metrics.to_dict(self.stats)
+        report.update(self._data_stage_report())
+        return report
+    def save_report(self, path: Optional[Path] = None) -> Path:
+        if path:
+            path = Path(path)
+        elif self.shard is not None:
+            # Cada nodo escribe su propio informe en la salida compartida
+            path = shard_file_path(self.output_directory, Config.METRICS_REPORT_FILENAME, self.shard)
+        else:
+            path = self.output_directory / Config.METRICS_REPORT_FILENAME
+        self.metrics.write_report(path, self.stats, self._data_stage_report())
+        return path
+    def save_shard_stats(self) -> Path:
+        # Los PDFs sin referencia se guardan por nombre: al combinar, solo cuentan los que ningún fragmento usó
+        if self.shard is None:
+            raise ValueError("save_shard_stats requiere un fragmento (shard)")
+        path = shard_file_path(self.output_directory, Config.SHARD_STATS_FILENAME, self.shard)
+        data = {
+            'shard': list(self.shard),
+            'shard_by': self.shard_by,
+            'stats': asdict(self.stats),
+            'unmatched': sorted(entry.name for entry in self.pdf_index.unmatched()) if self.pdf_index else [],
+        }
+        temporary = path.with_name(f"{path.name}.tmp")
+        with open(temporary, 'w', encoding='utf-8') as f:
+            json.dump(data, f, ensure_ascii=False)
+        os.replace(temporary, path)
+        return path
     def print_summary(self) -> None:
         print(f"\n=== RESUMEN ===")
         print(f"Carpetas creadas: {self.stats.folders_created}")
         print(f"Archivos copiados exitosamente: {self.stats.files_moved}")
         print(f"Archivos no encontrados: {self.stats.files_not_found}")
+        print(f"Archivos sin cambios (omitidos): {self.stats.files_skipped}")
         print(f"Total de registros procesados: {self.stats.total_records}")
-    def print_directory_structure(self) -> None:
+        print(f"PDFs sin referencia en los datos: {self.stats.unmatched_pdfs}")
+        if self.stats.bytes_saved:
+            print(f"Espacio ahorrado por deduplicación: {self.stats.bytes_saved / (1024 * 1024):.1f} MB")
+        if self.stats.placement_modes:
+            modes = ", ".join(f"{mode}: {count}" for mode, count in sorted(self.stats.placement_modes.items()))
+            print(f"Modos de colocación: {modes}")
+        if 'total' in self.metrics.stage_seconds:
+            report = self.metrics.to_dict(self.stats)
+            latency = report['copy_latency_seconds']
+            print(f"Tiempo total: {self.metrics.stage_seconds['total']:.2f} s "
+                  f"({report['files_per_second']:.0f} archivos/s, {report['megabytes_per_second']:.1f} MB/s, "
+                  f"p50 {latency['p50'] * 1000:.1f} ms, p99 {latency['p99'] * 1000:.1f} ms)")
+    def print_directory_structure(self, limit: int = Config.STRUCTURE_PRINT_LIMIT, page: int = 1,
+                                  audit: bool = False) -> None:
+        # La estructura sale del plan y de los conteos hechos al copiar; el disco solo se lee al auditar
         print(f"\n=== ESTRUCTURA CREADA ===")
+        entries = self.directory_plan.entries()
+        pages = max(1, math.ceil(len(entries) / limit)) if limit else 1
+        page = min(max(1, page), pages)
+        shown = entries[(page - 1) * limit:page * limit] if limit else entries
+        if shown and len(shown[0][0]) > 1:
+            # Repetir los directorios padre para que la página se entienda sola
+            first = shown[0][0]
+            shown = [(first[:depth], None) for depth in range(1, len(first))] + shown
+        for parts, pdf_count in shown:
+            indent = "  " * (len(parts) - 1)
+            suffix = f" ({pdf_count} archivos)" if pdf_count is not None else ""
+            print(f"{indent}📁 {parts[-1]}/{suffix}")
+        if pages > 1:
+            print(f"... página {page} de {pages} ({len(entries)} carpetas en total)")
+        if audit:
+            self.audit_directory_structure()
+    def audit_directory_structure(self) -> bool:
+        print(f"\n=== AUDITORÍA DE LA ESTRUCTURA ===")
         try:
-            for location_dir in sorted(self.output_directory.iterdir()):
-                if location_dir.is_dir():
-                    print(f"📁 {location_dir.name}/")
-                    for requester_dir in sorted(location_dir.iterdir()):
-                        if requester_dir.is_dir():
-                            print(f"  📁 {requester_dir.name}/")
-                            for supplier_dir in sorted(requester_dir.iterdir()):
-                                if supplier_dir.is_dir():
-                                    pdf_count = count_pdf_files(str(supplier_dir))
-                                    print(f"    📁 {supplier_dir.name}/ ({pdf_count} archivos)")
+            mismatches = self.directory_plan.audit()
         except Exception as e:
-            print(f"Error al mostrar estructura: {e}")
\ No newline at end of file
+            print(f"Error al auditar estructura: {e}")
+            return False
+        for parts, expected, found in mismatches:
+            print(f"⚠️  {'/'.join(parts)}: {expected} archivos esperados, {found} en disco")
+        if not mismatches:
+            print("✅ La estructura en disco coincide con la organización")
+        return not mismatches
\ No newline at end of file
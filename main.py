@@ -49,7 +49,6 @@ class PurchaseOrderOrganizer:
         """
         try:
             self.data_handler = DataHandler(file_path)
-            self.data_handler.load_data()
             self.data_handler.validate_columns()
             self.data_handler.print_preview()
             return True
@@ -84,8 +83,9 @@ class PurchaseOrderOrganizer:
             print(f"📁 Carpeta destino: {output_dir}")
             print("-" * 50)
             
-            # Crear organizador y ejecutar
-            self.organizer = FileOrganizer(data_file, pdf_dir, output_dir)
+            # Crear organizador reutilizando los datos ya validados
+            data_source = self.data_handler if self.data_handler is not None else data_file
+            self.organizer = FileOrganizer(data_source, pdf_dir, output_dir)
             stats = self.organizer.organize_files()
             
             # Mostrar resultados
@@ -0,0 +1,209 @@
+"""
+Manifiesto de ejecución para organizaciones incrementales y reanudables.
+
+El manifiesto vive en el directorio de salida y registra, por cada archivo
+colocado, el origen, su tamaño, su fecha de modificación y el destino. Se
+escribe en formato JSON Lines y se va ampliando durante la ejecución, de
+modo que si el proceso se interrumpe la siguiente ejecución retoma desde
+el último archivo registrado.
+"""
+
+import json
+import os
+import threading
+from pathlib import Path
+from typing import Dict, List, Optional, Tuple
+
+from config import Config
+from pdf_index import PDFEntry
+from sharding import shard_file_path
+
+
+def shard_manifest_path(output_directory: Path, shard_index: int, shard_count: int) -> Path:
+    """
+    Ruta del manifiesto de un fragmento.
+
+    Args:
+        output_directory: Directorio de salida
+        shard_index: Índice del fragmento (desde 0)
+        shard_count: Número total de fragmentos
+
+    Returns:
+        Ruta del archivo del fragmento, junto al manifiesto principal
+    """
+    return shard_file_path(output_directory, Config.MANIFEST_FILENAME, (shard_index, shard_count))
+
+
+class RunManifest:
+    """Registro persistente de los archivos ya colocados en la salida."""
+
+    def __init__(self, output_directory: Path, shard: Optional[Tuple[int, int]] = None):
+        """
+        Inicializa el manifiesto.
+
+        Args:
+            output_directory: Directorio de salida de la organización
+            shard: (índice, total) si la ejecución procesa un solo fragmento; cada
+                fragmento escribe su propio archivo para no competir con los demás
+        """
+        self.output_directory = Path(output_directory)
+        self.main_path = self.output_directory / Config.MANIFEST_FILENAME
+        self.path = shard_manifest_path(self.output_directory, *shard) if shard else self.main_path
+        # Entradas de ejecuciones anteriores (solo se consultan) y de la ejecución actual
+        self.previous: Dict[str, Dict] = {}
+        self.entries: Dict[str, Dict] = {}
+        # Entradas del archivo del fragmento que aún no se combinaron en el principal
+        self._unmerged: Dict[str, Dict] = {}
+        self._lock = threading.Lock()
+        self._file = None
+        self._pending_writes = 0
+
+    def load(self, previous: Optional[Dict[str, Dict]] = None) -> 'RunManifest':
+        """
+        Carga el manifiesto existente, si lo hay.
+
+        Las líneas incompletas (por ejemplo, la última línea de una ejecución
+        interrumpida) se ignoran.
+
+        Args:
+            previous: Entradas del manifiesto principal ya leídas por otro
+                proceso (ver ShardedOrganizer); si se indican, el principal
+                no se vuelve a leer
+
+        Returns:
+            El propio manifiesto
+        """
+        self.entries = {}
+        self._unmerged = {}
+        if previous is not None:
+            self.previous = dict(previous)
+        else:
+            self.previous = {}
+            self._read(self.main_path, self.previous)
+        if self.path != self.main_path:
+            self._read(self.path, self._unmerged)
+            self.previous.update(self._unmerged)
+        return self
+
+    @staticmethod
+    def _read(path: Path, entries: Dict[str, Dict]) -> None:
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        entry = json.loads(line)
+                        entries[entry['destination']] = entry
+                    except (ValueError, KeyError, TypeError):
+                        continue
+        except FileNotFoundError:
+            pass
+
+    def is_up_to_date(self, destination: str, source: PDFEntry) -> bool:
+        """
+        Indica si un destino ya contiene la versión actual del origen.
+
+        Solo cuentan las entradas de ejecuciones anteriores: un destino
+        registrado durante esta ejecución no hace que otra aparición del
+        mismo destino se dé por colocada, así el resultado no depende del
+        tamaño de bloque ni del orden en que terminan los hilos.
+
+        Args:
+            destination: Ruta del destino relativa al directorio de salida
+            source: Entrada del PDF de origen
+
+        Returns:
+            True si el manifiesto registra el mismo origen, tamaño y fecha
+            (no comprueba que el destino siga existiendo; ver
+            DirectoryPlan.has_file)
+        """
+        entry = self.previous.get(destination)
+        return (
+            entry is not None
+            and entry['source'] == str(source.path)
+            and entry['size'] == source.size
+            and entry['mtime'] == source.mtime
+        )
+
+    def record(self, destination: str, source: PDFEntry, mode: Optional[str] = None) -> None:
+        """
+        Registra un archivo colocado y lo añade al manifiesto en disco.
+
+        Args:
+            destination: Ruta del destino relativa al directorio de salida
+            source: Entrada del PDF de origen
+            mode: Modo de colocación utilizado
+        """
+        entry = {
+            'source': str(source.path),
+            'size': source.size,
+            'mtime': source.mtime,
+            'destination': destination,
+            'mode': mode,
+        }
+        line = json.dumps(entry, ensure_ascii=False) + "\n"
+
+        with self._lock:
+            self.entries[destination] = entry
+            if self._file is None:
+                self._file = open(self.path, 'a', encoding='utf-8')
+            self._file.write(line)
+            self._pending_writes += 1
+            if self._pending_writes >= Config.MANIFEST_FLUSH_INTERVAL:
+                self._file.flush()
+                self._pending_writes = 0
+
+    def flush(self) -> None:
+        """Escribe en disco las entradas registradas hasta ahora."""
+        with self._lock:
+            if self._file is not None:
+                self._file.flush()
+                self._pending_writes = 0
+
+    def close(self) -> None:
+        """
+        Cierra el manifiesto y lo reescribe compactado.
+
+        Cada destino queda con una sola línea; la reescritura es atómica.
+        El manifiesto de un fragmento no copia el principal: guarda solo lo
+        que el fragmento colocó y aún no se combinó (ver merge).
+        """
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+                self._pending_writes = 0
+
+            if self.path == self.main_path:
+                entries = {**self.previous, **self.entries}
+            else:
+                entries = {**self._unmerged, **self.entries}
+            if not entries:
+                return
+
+            temporary = self.path.with_name(f"{self.path.name}.tmp")
+            with open(temporary, 'w', encoding='utf-8') as f:
+                for entry in entries.values():
+                    f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+            os.replace(temporary, self.path)
+
+    @classmethod
+    def merge(cls, output_directory: Path) -> List[Path]:
+        """
+        Combina en el manifiesto principal los manifiestos de todos los fragmentos.
+
+        Los archivos de los fragmentos se eliminan una vez combinados.
+
+        Args:
+            output_directory: Directorio de salida
+
+        Returns:
+            Manifiestos de fragmentos combinados
+        """
+        manifest = cls(output_directory).load()
+        shard_paths = sorted(manifest.output_directory.glob(f"{Path(Config.MANIFEST_FILENAME).stem}.shard-*.jsonl"))
+        for shard_path in shard_paths:
+            manifest._read(shard_path, manifest.entries)
+        manifest.close()
+        for shard_path in shard_paths:
+            shard_path.unlink()
+        return shard_paths
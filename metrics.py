@@ -0,0 +1,166 @@
+"""
+Instrumentación de tiempos y rendimiento del organizador.
+
+Todas las mediciones son de costo constante (un perf_counter y una suma),
+de modo que pueden dejarse activas en producción.
+"""
+
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import asdict
+from pathlib import Path
+from typing import Dict, Iterator, List, Optional
+
+
+@contextmanager
+def stage_timer(timings: Dict[str, float], stage: str) -> Iterator[None]:
+    """
+    Acumula en un diccionario el tiempo de pared de una etapa.
+
+    Args:
+        timings: Diccionario etapa -> segundos acumulados
+        stage: Nombre de la etapa
+    """
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        timings[stage] = timings.get(stage, 0.0) + time.perf_counter() - start
+
+
+class LatencyHistogram:
+    """
+    Histograma de latencias con cubetas logarítmicas.
+
+    Usa memoria constante sin importar el número de muestras; los
+    percentiles tienen una resolución relativa de alrededor del 12 %.
+    """
+
+    MIN_SECONDS = 1e-6
+    BUCKETS_PER_DECADE = 20
+    DECADES = 9  # De 1 µs a 1000 s
+
+    def __init__(self):
+        """Inicializa un histograma vacío."""
+        self._counts: List[int] = [0] * (self.BUCKETS_PER_DECADE * self.DECADES + 1)
+        self._lock = threading.Lock()
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def _bucket(self, seconds: float) -> int:
+        if seconds <= self.MIN_SECONDS:
+            return 0
+        index = int(math.log10(seconds / self.MIN_SECONDS) * self.BUCKETS_PER_DECADE) + 1
+        return min(index, len(self._counts) - 1)
+
+    def _upper_bound(self, bucket: int) -> float:
+        return self.MIN_SECONDS * 10 ** (bucket / self.BUCKETS_PER_DECADE)
+
+    def record(self, seconds: float) -> None:
+        """
+        Registra una latencia.
+
+        Args:
+            seconds: Duración de la operación
+        """
+        bucket = self._bucket(seconds)
+        with self._lock:
+            self._counts[bucket] += 1
+            self.count += 1
+            self.total += seconds
+            if seconds > self.maximum:
+                self.maximum = seconds
+
+    def percentile(self, percent: float) -> float:
+        """
+        Calcula un percentil aproximado.
+
+        Args:
+            percent: Percentil entre 0 y 100
+
+        Returns:
+            Límite superior de la cubeta que contiene el percentil (0 sin muestras)
+        """
+        with self._lock:
+            if self.count == 0:
+                return 0.0
+            target = max(1, math.ceil(self.count * percent / 100))
+            cumulative = 0
+            for bucket, bucket_count in enumerate(self._counts):
+                cumulative += bucket_count
+                if cumulative >= target:
+                    return min(self._upper_bound(bucket), self.maximum)
+            return self.maximum
+
+    def to_dict(self) -> Dict[str, float]:
+        """Resumen del histograma en segundos."""
+        return {
+            'count': self.count,
+            'mean': self.total / self.count if self.count else 0.0,
+            'p50': self.percentile(50),
+            'p90': self.percentile(90),
+            'p99': self.percentile(99),
+            'max': self.maximum,
+        }
+
+
+class RunMetrics:
+    """Tiempos por etapa y rendimiento de una ejecución."""
+
+    def __init__(self):
+        """Inicializa métricas vacías."""
+        self.stage_seconds: Dict[str, float] = {}
+        self.copy_latency = LatencyHistogram()
+
+    def stage(self, name: str):
+        """
+        Context manager que mide una etapa.
+
+        Args:
+            name: Nombre de la etapa
+        """
+        return stage_timer(self.stage_seconds, name)
+
+    def to_dict(self, stats, placement_seconds: Optional[float] = None) -> Dict:
+        """
+        Construye el informe estructurado de la ejecución.
+
+        Args:
+            stats: OrganizationStats de la ejecución
+            placement_seconds: Segundos dedicados a colocar archivos (por
+                defecto, la suma de las etapas 'placement' y 'pool_drain')
+
+        Returns:
+            Diccionario serializable a JSON
+        """
+        if placement_seconds is None:
+            placement_seconds = (self.stage_seconds.get('placement', 0.0)
+                                 + self.stage_seconds.get('pool_drain', 0.0))
+        files_per_second = stats.files_moved / placement_seconds if placement_seconds else 0.0
+        megabytes_per_second = (stats.bytes_copied / (1024 * 1024) / placement_seconds
+                                if placement_seconds else 0.0)
+        return {
+            'stage_seconds': dict(self.stage_seconds),
+            'files_per_second': files_per_second,
+            'megabytes_per_second': megabytes_per_second,
+            'copy_latency_seconds': self.copy_latency.to_dict(),
+        }
+
+    def write_report(self, path: Path, stats, extra: Optional[Dict] = None) -> None:
+        """
+        Escribe el informe en formato JSON.
+
+        Args:
+            path: Ruta del archivo de informe
+            stats: OrganizationStats de la ejecución
+            extra: Datos adicionales a incluir
+        """
+        report = {'stats': asdict(stats), 'metrics': self.to_dict(stats)}
+        if extra:
+            report.update(extra)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
@@ -9,22 +9,39 @@ __version__ = "2.0.0"
 __author__ = "Tu Nombre"
 __email__ = "tu.email@ejemplo.com"
 
-# Importaciones principales para facilitar el uso del paquete
-from main import PurchaseOrderOrganizer, main
-from file_organizer import FileOrganizer
-from data_handler import DataHandler
-from gui_handler import GUIHandler
-from config import Config
+# Importaciones diferidas: los módulos (y con ellos tkinter y pandas) solo se
+# cargan al acceder por primera vez a cada nombre, para que el arranque sin
+# interfaz gráfica sea rápido
+_LAZY_IMPORTS = {
+    'PurchaseOrderOrganizer': 'main',
+    'main': 'main',
+    'FileOrganizer': 'file_organizer',
+    'DataHandler': 'data_handler',
+    'GUIHandler': 'gui_handler',
+    'Config': 'config',
+    # Reporte de progreso
+    'ProgressEvent': 'progress',
+    'ProgressReporter': 'progress',
+    'CallbackReporter': 'progress',
+    # Excepciones
+    'FileOrganizerError': 'exceptions',
+    'DataFileError': 'exceptions',
+    'MissingColumnsError': 'exceptions',
+    'PDFDirectoryError': 'exceptions',
+    'OutputDirectoryError': 'exceptions',
+    'UserCancellationError': 'exceptions',
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_IMPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    from importlib import import_module
+    value = getattr(import_module(module_name), name)
+    globals()[name] = value
+    return value
 
-# Excepciones principales
-from exceptions import (
-    FileOrganizerError,
-    DataFileError,
-    MissingColumnsError,
-    PDFDirectoryError,
-    OutputDirectoryError,
-    UserCancellationError
-)
 
 __all__ = [
     'PurchaseOrderOrganizer',
@@ -33,6 +50,10 @@ __all__ = [
     'GUIHandler',
     'Config',
     'main',
+    # Reporte de progreso
+    'ProgressEvent',
+    'ProgressReporter',
+    'CallbackReporter',
     # Excepciones
     'FileOrganizerError',
     'DataFileError',
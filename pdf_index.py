@@ -0,0 +1,196 @@
+"""
+Índice del directorio de PDFs para el organizador de órdenes de compra.
+"""
+
+import os
+import stat
+import sys
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Set
+
+from config import Config
+
+
+# Sistemas cuyos nombres de archivo no distinguen mayúsculas (NTFS y APFS por defecto)
+CASE_INSENSITIVE_NAMES = sys.platform.startswith(('win', 'cygwin', 'darwin'))
+
+
+def is_pdf_name(name: str) -> bool:
+    """Indica si un nombre de archivo tiene la extensión PDF, sin importar mayúsculas."""
+    return name.lower().endswith(Config.PDF_EXTENSION.lower())
+
+
+def invoice_key(invoice: str) -> str:
+    """
+    Clave con la que se busca una factura en el índice.
+
+    En Windows y macOS "FAC001" y "fac001" son el mismo archivo, así que la
+    clave se normaliza igual que hace el sistema; en el resto se usa tal cual.
+
+    Args:
+        invoice: Número de factura (nombre del PDF sin extensión)
+
+    Returns:
+        Clave normalizada
+    """
+    if CASE_INSENSITIVE_NAMES:
+        return os.path.normcase(invoice).lower()
+    return invoice
+
+
+class PDFEntry(NamedTuple):
+    """Representa un PDF encontrado en el directorio de origen."""
+    name: str
+    path: Path
+    size: int
+    mtime: float
+
+
+class PDFIndex:
+    """
+    Índice en memoria de los PDFs de un directorio.
+
+    Se construye con una sola pasada de os.scandir, de modo que buscar una
+    factura no requiere ninguna consulta adicional al sistema de archivos.
+    La extensión se reconoce sin importar mayúsculas ("FAC001.PDF") y las
+    facturas se buscan con invoice_key, como lo haría el sistema de archivos.
+    """
+
+    def __init__(self, directory: Path, entries: Dict[str, PDFEntry]):
+        """
+        Inicializa el índice.
+
+        Args:
+            directory: Directorio indexado
+            entries: Diccionario invoice_key(factura) -> entrada
+        """
+        self.directory = Path(directory)
+        self.entries = entries
+        self._matched: Set[str] = set()
+
+    @classmethod
+    def build(cls, directory) -> 'PDFIndex':
+        """
+        Construye el índice recorriendo el directorio una sola vez.
+
+        Args:
+            directory: Directorio con los PDFs
+
+        Returns:
+            Índice con todos los PDFs del directorio
+        """
+        directory = Path(directory)
+        entries: Dict[str, PDFEntry] = {}
+
+        with os.scandir(directory) as iterator:
+            for entry in iterator:
+                if not is_pdf_name(entry.name):
+                    continue
+                try:
+                    if not entry.is_file():
+                        continue
+                    file_stat = entry.stat()
+                except OSError:
+                    continue
+                cls._add(entries, PDFEntry(
+                    entry.name, directory / entry.name, file_stat.st_size, file_stat.st_mtime
+                ))
+
+        return cls(directory, entries)
+
+    @staticmethod
+    def _key(name: str) -> str:
+        return invoice_key(name[:-len(Config.PDF_EXTENSION)])
+
+    @classmethod
+    def _add(cls, entries: Dict[str, PDFEntry], entry: PDFEntry) -> None:
+        # Si "FAC001.pdf" y "FAC001.PDF" conviven (sistemas que distinguen
+        # mayúsculas), se usa el de la extensión exacta
+        key = cls._key(entry.name)
+        current = entries.get(key)
+        if (current is None or current.name == entry.name
+                or not current.name.endswith(Config.PDF_EXTENSION)):
+            entries[key] = entry
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+    def __iter__(self) -> Iterator[PDFEntry]:
+        return iter(self.entries.values())
+
+    def __contains__(self, invoice: str) -> bool:
+        return invoice_key(invoice) in self.entries
+
+    def lookup(self, invoice: str) -> Optional[PDFEntry]:
+        """
+        Busca el PDF correspondiente a una factura.
+
+        Args:
+            invoice: Número de factura (nombre del PDF sin extensión)
+
+        Returns:
+            Entrada del PDF o None si no existe
+        """
+        key = invoice_key(invoice)
+        entry = self.entries.get(key)
+        if entry is not None:
+            self._matched.add(key)
+        return entry
+
+    def subset(self, invoices: Iterable[str]) -> 'PDFIndex':
+        """
+        Crea un índice con solo los PDFs de unas facturas.
+
+        Las facturas encontradas quedan marcadas como referenciadas en este
+        índice, igual que con lookup.
+
+        Args:
+            invoices: Números de factura
+
+        Returns:
+            Índice reducido sobre el mismo directorio
+        """
+        entries: Dict[str, PDFEntry] = {}
+        for invoice in invoices:
+            entry = self.lookup(invoice)
+            if entry is not None:
+                entries[invoice_key(invoice)] = entry
+        return PDFIndex(self.directory, entries)
+
+    def refresh(self, name: str) -> Optional[PDFEntry]:
+        """
+        Actualiza la entrada de un archivo que se creó, cambió o desapareció.
+
+        Args:
+            name: Nombre del archivo dentro del directorio indexado
+
+        Returns:
+            Entrada actualizada, o None si el archivo ya no es un PDF existente
+        """
+        path = self.directory / name
+        try:
+            file_stat = path.stat()
+        except OSError:
+            file_stat = None
+        if not is_pdf_name(name):
+            return None
+        key = self._key(name)
+        if file_stat is None or not stat.S_ISREG(file_stat.st_mode):
+            if key in self.entries and self.entries[key].name == name:
+                del self.entries[key]
+            return None
+        entry = PDFEntry(name, path, file_stat.st_size, file_stat.st_mtime)
+        self._add(self.entries, entry)
+        return entry
+
+    def unmatched(self) -> List[PDFEntry]:
+        """
+        Obtiene los PDFs del directorio que ningún registro ha referenciado.
+
+        Returns:
+            Lista de entradas no referenciadas, ordenadas por nombre
+        """
+        return sorted(
+            (entry for key, entry in self.entries.items() if key not in self._matched),
+            key=lambda entry: entry.name
+        )
@@ -0,0 +1,165 @@
+"""
+Modos de colocación de archivos para el organizador de órdenes de compra.
+
+Además de la copia completa (shutil.copy2), un PDF puede colocarse en su
+destino como enlace duro, como clon copy-on-write (reflink) o como enlace
+simbólico, evitando duplicar los bytes cuando origen y destino comparten
+volumen.
+"""
+
+import errno
+import os
+import shutil
+import sys
+import uuid
+from pathlib import Path
+from typing import Callable, Dict, Set, Tuple
+
+from exceptions import PlacementModeError
+
+
+PLACEMENT_MODES: Tuple[str, ...] = ('copy', 'hardlink', 'reflink', 'symlink', 'auto')
+
+# Orden de prueba del modo 'auto', del más barato al más caro.
+# Los enlaces simbólicos se excluyen porque dependen de que el origen siga existiendo.
+AUTO_ORDER: Tuple[str, ...] = ('reflink', 'hardlink', 'copy')
+
+# ioctl de Linux para clonar un archivo completo (linux/fs.h)
+FICLONE = 0x40049409
+
+# Errores que indican que el sistema de archivos no soporta el modo.
+# EMLINK (el origen llegó a su límite de enlaces) y EPERM (por ejemplo,
+# protected_hardlinks de Linux) dependen de cada archivo: ese archivo pasa al
+# modo siguiente sin descartar el modo para el resto de la ejecución.
+_UNSUPPORTED_ERRNOS = {
+    errno.EXDEV, errno.EOPNOTSUPP, errno.ENOTTY, errno.EINVAL,
+    errno.ENOSYS,
+}
+
+
+def _temporary_sibling(destination: Path) -> Path:
+    return destination.with_name(f".{destination.name}.{uuid.uuid4().hex}.tmp")
+
+
+def _replace_with(destination: Path, create: Callable[[Path], None]) -> None:
+    """Crea el archivo junto al destino y lo reemplaza de forma atómica."""
+    temporary = _temporary_sibling(destination)
+    try:
+        create(temporary)
+        os.replace(temporary, destination)
+    except BaseException:
+        try:
+            temporary.unlink()
+        except OSError:
+            pass
+        raise
+
+
+def _place_copy(source: Path, destination: Path) -> None:
+    # Nunca se escribe sobre el destino: puede ser un enlace al origen o compartir
+    # su inodo con otras salidas (deduplicación, ejecuciones en otro modo)
+    _replace_with(destination, lambda temporary: shutil.copy2(source, temporary))
+
+
+def _place_hardlink(source: Path, destination: Path) -> None:
+    try:
+        if os.path.samefile(source, destination):
+            return
+    except OSError:
+        pass
+    _replace_with(destination, lambda temporary: os.link(source, temporary))
+
+
+def _clone(source: Path, temporary: Path) -> None:
+    import fcntl
+
+    with open(source, 'rb') as source_file, open(temporary, 'wb') as temporary_file:
+        fcntl.ioctl(temporary_file.fileno(), FICLONE, source_file.fileno())
+    shutil.copystat(source, temporary)
+
+
+def _place_reflink(source: Path, destination: Path) -> None:
+    if not sys.platform.startswith('linux'):
+        raise OSError(errno.EOPNOTSUPP, "reflink solo está disponible en Linux")
+    _replace_with(destination, lambda temporary: _clone(source, temporary))
+
+
+def _place_symlink(source: Path, destination: Path) -> None:
+    target = os.path.abspath(source)
+    _replace_with(destination, lambda temporary: os.symlink(target, temporary))
+
+
+_PLACERS: Dict[str, Callable[[Path, Path], None]] = {
+    'copy': _place_copy,
+    'hardlink': _place_hardlink,
+    'reflink': _place_reflink,
+    'symlink': _place_symlink,
+}
+
+
+def validate_placement_mode(mode: str) -> str:
+    """
+    Valida un modo de colocación.
+
+    Args:
+        mode: Modo solicitado
+
+    Returns:
+        El modo validado
+
+    Raises:
+        PlacementModeError: Si el modo no es válido
+    """
+    if mode not in PLACEMENT_MODES:
+        raise PlacementModeError(mode, PLACEMENT_MODES)
+    return mode
+
+
+class FilePlacer:
+    """
+    Coloca archivos en su destino según el modo configurado.
+
+    En modo 'auto' prueba los modos de AUTO_ORDER para cada archivo y
+    recuerda los que el sistema de archivos no soporta, para no volver a
+    intentarlos en el resto de la ejecución.
+    """
+
+    def __init__(self, mode: str = 'copy'):
+        """
+        Inicializa el colocador.
+
+        Args:
+            mode: Uno de PLACEMENT_MODES
+        """
+        self.mode = validate_placement_mode(mode)
+        self._unsupported: Set[str] = set()
+
+    def place(self, source: Path, destination: Path) -> str:
+        """
+        Coloca un archivo en su destino.
+
+        Args:
+            source: Archivo de origen
+            destination: Ruta de destino
+
+        Returns:
+            Modo que se usó efectivamente
+
+        Raises:
+            OSError: Si no se pudo colocar el archivo
+        """
+        if self.mode != 'auto':
+            _PLACERS[self.mode](source, destination)
+            return self.mode
+
+        candidates = [mode for mode in AUTO_ORDER if mode not in self._unsupported]
+        for mode in candidates[:-1]:
+            try:
+                _PLACERS[mode](source, destination)
+                return mode
+            except OSError as e:
+                if e.errno in _UNSUPPORTED_ERRNOS:
+                    self._unsupported.add(mode)
+
+        _PLACERS[candidates[-1]](source, destination)
+        return candidates[-1]
@@ -0,0 +1,243 @@
+"""
+Reporte de progreso del organizador.
+
+Los eventos de la organización (carpetas creadas, archivos colocados, no
+encontrados, etc.) se envían a un ProgressReporter intercambiable:
+
+- ConsoleReporter: una línea por carpeta y por archivo (comportamiento clásico).
+- QuietReporter: solo una barra de progreso resumida y limitada en frecuencia.
+- LogFileReporter: barra resumida en consola y cada evento en un archivo de
+  log escrito por un hilo en segundo plano con buffer.
+- CallbackReporter: entrega cada evento a una función, para integrar el
+  organizador en otras aplicaciones.
+"""
+
+import queue
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Callable, NamedTuple, Optional, TextIO
+
+from config import Config
+
+
+class ProgressEvent(NamedTuple):
+    """Evento de progreso de la organización."""
+    kind: str  # folder_created, file_placed, file_not_found, file_error, file_skipped
+    name: str
+    destination: Optional[Path] = None
+    mode: Optional[str] = None
+    error: Optional[str] = None
+
+
+class ProgressReporter:
+    """Reporter base: ignora todos los eventos."""
+
+    def start(self, output_directory: Path) -> None:
+        """
+        Se llama al comenzar la organización.
+
+        Args:
+            output_directory: Directorio raíz de la salida
+        """
+        self.output_directory = Path(output_directory)
+
+    def records_loaded(self, count: int) -> None:
+        """
+        Se llama cada vez que se carga un bloque de registros.
+
+        Args:
+            count: Registros del bloque
+        """
+
+    def emit(self, event: ProgressEvent) -> None:
+        """
+        Recibe un evento. Puede llamarse desde varios hilos a la vez.
+
+        Args:
+            event: Evento de progreso
+        """
+
+    def finish(self) -> None:
+        """Se llama al terminar la organización."""
+
+
+class ConsoleReporter(ProgressReporter):
+    """Imprime una línea por cada carpeta y cada archivo."""
+
+    def __init__(self):
+        """Inicializa el reporter."""
+        # Evita que las líneas de varios hilos de copia se mezclen
+        self._lock = threading.Lock()
+
+    def _format(self, event: ProgressEvent) -> Optional[str]:
+        if event.kind == 'folder_created':
+            indent = "  " * event.name.count("/")
+            return f"Carpeta creada: {indent}📁 {event.name}"
+        if event.kind == 'file_placed':
+            destination = event.destination.relative_to(self.output_directory).as_posix()
+            action = "copiado" if event.mode == 'copy' else f"colocado ({event.mode})"
+            return f"      📄 Archivo {action}: {event.name} -> {destination}/"
+        if event.kind == 'file_error':
+            return f"      ❌ Error al copiar {event.name}: {event.error}"
+        if event.kind == 'file_not_found':
+            return f"      ❓ Archivo no encontrado: {event.name}"
+        return None
+
+    def emit(self, event: ProgressEvent) -> None:
+        line = self._format(event)
+        if line is not None:
+            with self._lock:
+                sys.stdout.write(line + "\n")
+
+
+class QuietReporter(ProgressReporter):
+    """Muestra solo una barra de progreso con un máximo de actualizaciones por segundo."""
+
+    def __init__(self, stream: Optional[TextIO] = None,
+                 max_updates_per_second: float = Config.PROGRESS_MAX_UPDATES_PER_SECOND):
+        """
+        Inicializa el reporter.
+
+        Args:
+            stream: Flujo donde escribir la barra (stdout por defecto)
+            max_updates_per_second: Frecuencia máxima de actualización
+        """
+        self.stream = stream
+        self.min_interval = 1 / max_updates_per_second
+        self._lock = threading.Lock()
+        self.total = 0
+        self.processed = 0
+        self.errors = 0
+        self.not_found = 0
+        self._started = 0.0
+        self._last_update = 0.0
+
+    def start(self, output_directory: Path) -> None:
+        super().start(output_directory)
+        self._started = time.perf_counter()
+
+    def records_loaded(self, count: int) -> None:
+        with self._lock:
+            self.total += count
+
+    def emit(self, event: ProgressEvent) -> None:
+        if event.kind == 'folder_created':
+            return
+        with self._lock:
+            self.processed += 1
+            if event.kind == 'file_error':
+                self.errors += 1
+            elif event.kind == 'file_not_found':
+                self.not_found += 1
+            now = time.perf_counter()
+            if now - self._last_update < self.min_interval:
+                return
+            self._last_update = now
+            self._render(now)
+
+    def _render(self, now: float) -> None:
+        stream = self.stream or sys.stdout
+        elapsed = max(now - self._started, 1e-9)
+        percent = 100 * self.processed / self.total if self.total else 0.0
+        width = 30
+        filled = int(width * min(percent, 100) / 100)
+        stream.write(
+            f"\r[{'#' * filled}{'.' * (width - filled)}] {percent:5.1f}% "
+            f"{self.processed}/{self.total} | {self.processed / elapsed:.0f} reg/s | "
+            f"{self.not_found} no encontrados | {self.errors} errores"
+        )
+        stream.flush()
+
+    def finish(self) -> None:
+        with self._lock:
+            self._render(time.perf_counter())
+            (self.stream or sys.stdout).write("\n")
+
+
+class LogFileReporter(QuietReporter):
+    """Barra resumida en consola y cada evento en un archivo de log."""
+
+    _STOP = object()
+
+    def __init__(self, log_path: Path, stream: Optional[TextIO] = None,
+                 max_updates_per_second: float = Config.PROGRESS_MAX_UPDATES_PER_SECOND):
+        """
+        Inicializa el reporter.
+
+        Args:
+            log_path: Archivo de log donde escribir los eventos
+            stream: Flujo donde escribir la barra (stdout por defecto)
+            max_updates_per_second: Frecuencia máxima de actualización
+        """
+        super().__init__(stream, max_updates_per_second)
+        self.log_path = Path(log_path)
+        self._queue: queue.SimpleQueue = queue.SimpleQueue()
+        self._writer: Optional[threading.Thread] = None
+
+    def start(self, output_directory: Path) -> None:
+        super().start(output_directory)
+        if self._writer is None:
+            self._writer = threading.Thread(target=self._write_loop, name="progress-log", daemon=True)
+            self._writer.start()
+
+    def _write_loop(self) -> None:
+        with open(self.log_path, 'a', encoding='utf-8', buffering=1024 * 1024) as log_file:
+            while True:
+                item = self._queue.get()
+                if item is self._STOP:
+                    break
+                timestamp, event = item
+                destination = event.destination.as_posix() if event.destination else ""
+                detail = event.error or event.mode or ""
+                log_file.write(f"{timestamp:.6f}\t{event.kind}\t{event.name}\t{destination}\t{detail}\n")
+
+    def emit(self, event: ProgressEvent) -> None:
+        self._queue.put((time.time(), event))
+        super().emit(event)
+
+    def finish(self) -> None:
+        super().finish()
+        if self._writer is not None:
+            self._queue.put(self._STOP)
+            self._writer.join()
+            self._writer = None
+
+
+class CallbackReporter(ProgressReporter):
+    """Entrega cada evento a una función del llamador."""
+
+    def __init__(self, callback: Callable[[ProgressEvent], None]):
+        """
+        Inicializa el reporter.
+
+        Args:
+            callback: Función llamada con cada ProgressEvent
+        """
+        self.callback = callback
+
+    def emit(self, event: ProgressEvent) -> None:
+        self.callback(event)
+
+
+PROGRESS_MODES = ('console', 'quiet', 'verbose')
+
+
+def create_reporter(mode: str = Config.PROGRESS_MODE,
+                    log_path: Optional[Path] = None) -> ProgressReporter:
+    """
+    Crea un reporter a partir del nombre de un modo.
+
+    Args:
+        mode: 'console', 'quiet' o 'verbose'
+        log_path: Archivo de log del modo 'verbose'
+
+    Returns:
+        Reporter configurado
+    """
+    if mode == 'quiet':
+        return QuietReporter()
+    if mode == 'verbose':
+        return LogFileReporter(log_path or Config.PROGRESS_LOG_FILENAME)
+    return ConsoleReporter()
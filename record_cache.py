@@ -0,0 +1,194 @@
+"""
+Caché en disco de los registros normalizados de un archivo de datos.
+
+Cada entrada guarda los registros ya normalizados (en columnas categóricas,
+que son compactas y rápidas de cargar) junto con la vista previa del
+archivo. La clave es la huella del archivo (ruta, tamaño, fecha de
+modificación y hash del contenido) más la variante de lectura: biblioteca
+de DataFrames y modo de interpretación de las celdas, de modo que cada
+combinación tiene su propia entrada y nunca se sirven registros leídos de
+otra forma. El tamaño total se limita eliminando
+las entradas usadas hace más tiempo.
+"""
+
+import hashlib
+import json
+import os
+import pickle
+import uuid
+from pathlib import Path
+from typing import Dict, Optional
+
+from config import Config
+
+
+# Cambiar este valor invalida todas las entradas existentes
+# (2: los CSV completos de pandas pasaron a leerse como texto)
+CACHE_FORMAT_VERSION = 2
+
+_INDEX_FILENAME = "index.json"
+_ENTRY_SUFFIX = ".pkl"
+
+
+def hash_file_content(file_path: Path, block_size: int = 1024 * 1024) -> str:
+    """
+    Calcula el hash del contenido de un archivo.
+
+    Args:
+        file_path: Archivo a leer
+        block_size: Tamaño de los bloques leídos
+
+    Returns:
+        Hash BLAKE2b en hexadecimal
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    with open(file_path, 'rb') as f:
+        for block in iter(lambda: f.read(block_size), b''):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _write_atomic(path: Path, data: bytes) -> None:
+    temporary = path.with_name(f".{path.name}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(temporary, 'wb') as f:
+            f.write(data)
+        os.replace(temporary, path)
+    finally:
+        if temporary.exists():
+            temporary.unlink()
+
+
+class RecordCache:
+    """Caché de registros normalizados con invalidación automática y LRU."""
+
+    def __init__(self, directory: Optional[Path] = None, max_bytes: Optional[int] = None):
+        """
+        Inicializa la caché.
+
+        Args:
+            directory: Directorio de la caché (Config.CACHE_DIRECTORY por defecto)
+            max_bytes: Tamaño máximo total (Config.CACHE_MAX_BYTES por defecto)
+        """
+        self.directory = Path(directory or Config.CACHE_DIRECTORY)
+        self.max_bytes = Config.CACHE_MAX_BYTES if max_bytes is None else max_bytes
+        self._index_path = self.directory / _INDEX_FILENAME
+
+    def _read_index(self) -> Dict[str, Dict]:
+        try:
+            with open(self._index_path, 'r', encoding='utf-8') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def _write_index(self, index: Dict[str, Dict]) -> None:
+        _write_atomic(self._index_path, json.dumps(index).encode('utf-8'))
+
+    @staticmethod
+    def _content_key(content_hash: str) -> str:
+        return hashlib.blake2b(
+            f"{content_hash}|{CACHE_FORMAT_VERSION}|{'|'.join(Config.REQUIRED_COLUMNS)}".encode('utf-8'),
+            digest_size=20
+        ).hexdigest()
+
+    def _entry_path(self, content_hash: str, variant: str) -> Path:
+        # Las variantes de un mismo contenido comparten prefijo para poder eliminarlas juntas
+        return self.directory / f"{self._content_key(content_hash)}.{variant}{_ENTRY_SUFFIX}"
+
+    def _remove_entries(self, content_hash: str) -> None:
+        for path in self.directory.glob(f"{self._content_key(content_hash)}.*{_ENTRY_SUFFIX}"):
+            self._remove(path)
+
+    def fingerprint(self, file_path: Path) -> str:
+        """
+        Obtiene el hash del contenido de un archivo de datos.
+
+        Si la ruta, el tamaño y la fecha de modificación coinciden con los
+        registrados, se reutiliza el hash conocido sin volver a leer el archivo.
+
+        Args:
+            file_path: Archivo de datos
+
+        Returns:
+            Hash del contenido
+        """
+        path = Path(file_path).resolve()
+        stat = path.stat()
+        index = self._read_index()
+        known = index.get(str(path))
+        if known and known['size'] == stat.st_size and known['mtime_ns'] == stat.st_mtime_ns:
+            return known['hash']
+
+        content_hash = hash_file_content(path)
+        if known and known['hash'] != content_hash:
+            # El archivo cambió: sus entradas anteriores ya no sirven
+            if not any(other['hash'] == known['hash'] for key, other in index.items() if key != str(path)):
+                self._remove_entries(known['hash'])
+        index[str(path)] = {'size': stat.st_size, 'mtime_ns': stat.st_mtime_ns, 'hash': content_hash}
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self._write_index(index)
+        return content_hash
+
+    def load(self, file_path: Path, variant: str) -> Optional[Dict]:
+        """
+        Carga la entrada de un archivo de datos.
+
+        Args:
+            file_path: Archivo de datos
+            variant: Variante de lectura (por ejemplo "pandas-text")
+
+        Returns:
+            Contenido guardado o None si no hay entrada válida
+        """
+        try:
+            entry_path = self._entry_path(self.fingerprint(file_path), variant)
+            with open(entry_path, 'rb') as f:
+                payload = pickle.load(f)
+            # La fecha de modificación de la entrada marca su último uso
+            os.utime(entry_path)
+            return payload
+        except Exception:
+            return None
+
+    def store(self, file_path: Path, variant: str, payload: Dict) -> None:
+        """
+        Guarda la entrada de un archivo de datos.
+
+        Los errores de escritura se ignoran: la caché nunca interrumpe una
+        ejecución.
+
+        Args:
+            file_path: Archivo de datos
+            variant: Variante de lectura (ver load)
+            payload: Contenido a guardar
+        """
+        try:
+            entry_path = self._entry_path(self.fingerprint(file_path), variant)
+            _write_atomic(entry_path, pickle.dumps(payload, protocol=pickle.HIGHEST_PROTOCOL))
+            self.evict()
+        except Exception:
+            pass
+
+    def evict(self) -> None:
+        """Elimina las entradas menos usadas hasta respetar el tamaño máximo."""
+        entries = []
+        for path in self.directory.glob(f"*{_ENTRY_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+
+        total = sum(size for _, size, _ in entries)
+        for _, size, path in sorted(entries, key=lambda entry: entry[0]):
+            if total <= self.max_bytes:
+                break
+            self._remove(path)
+            total -= size
+
+    @staticmethod
+    def _remove(path: Path) -> None:
+        try:
+            path.unlink()
+        except OSError:
+            pass
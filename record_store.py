@@ -0,0 +1,257 @@
+"""
+Almacén compacto de registros en memoria.
+
+Una lista de tuplas guarda una cadena de Python por celda, de modo que con
+millones de filas los mismos proveedores, solicitantes y ubicaciones se
+repiten una y otra vez. RecordStore guarda esas tres columnas como códigos
+enteros sobre tablas de cadenas únicas (internadas) y las facturas en un
+único búfer UTF-8 contiguo con sus desplazamientos, como una columna de
+texto de Arrow. Las tuplas solo se crean al iterar, por bloques, y las
+cadenas de ubicación, solicitante y proveedor se comparten entre todas las
+tuplas que las usan.
+"""
+
+import sys
+from collections.abc import Sequence
+from typing import Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+Record = Tuple[str, str, str, str]
+
+# Registros materializados a la vez al iterar el almacén completo
+_ITER_BLOCK = 4096
+
+
+def _encode_column(series: pd.Series) -> Tuple[np.ndarray, List[str]]:
+    """Convierte una columna de texto en códigos enteros y su tabla de valores únicos."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Las columnas de la caché ya son categóricas: se reutilizan sus códigos
+        codes, uniques = series.cat.codes.to_numpy(), series.cat.categories
+    else:
+        codes, uniques = pd.factorize(series, sort=False)
+        codes = codes.astype(np.min_scalar_type(max(len(uniques) - 1, 0)))
+    return codes, [sys.intern(str(value)) for value in uniques]
+
+
+def _pack_strings(series: pd.Series) -> Tuple[bytes, np.ndarray]:
+    """Empaqueta una columna de texto en un búfer UTF-8 con desplazamientos absolutos."""
+    if isinstance(series.dtype, pd.CategoricalDtype):
+        # Cada valor distinto se codifica una vez y las filas solo lo referencian
+        categories = [str(value).encode('utf-8') for value in series.cat.categories]
+        codes = series.cat.codes.to_numpy()
+        lengths = np.fromiter(map(len, categories), dtype=np.int64, count=len(categories))[codes]
+        data = b''.join(map(categories.__getitem__, codes.tolist()))
+    else:
+        encoded = [value.encode('utf-8') for value in series.astype(str).tolist()]
+        lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=len(encoded))
+        data = b''.join(encoded)
+    offsets = np.zeros(len(lengths) + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    return data, offsets
+
+
+class RecordStore(Sequence):
+    """
+    Secuencia de registros (ubicación, solicitante, factura, proveedor) en formato compacto.
+
+    Se comporta como una lista de tuplas de solo lectura: admite len(),
+    indexación, rebanadas contiguas (que comparten la memoria del almacén
+    original) e iteración.
+    """
+
+    def __init__(self, codes: Tuple[np.ndarray, np.ndarray, np.ndarray],
+                 tables: Tuple[List[str], List[str], List[str]],
+                 invoice_data: bytes, invoice_offsets: np.ndarray):
+        """
+        Inicializa el almacén a partir de sus columnas ya codificadas.
+
+        Args:
+            codes: Códigos de ubicación, solicitante y proveedor de cada registro
+            tables: Valores únicos de ubicación, solicitante y proveedor
+            invoice_data: Facturas concatenadas en UTF-8
+            invoice_offsets: Desplazamientos de cada factura en invoice_data
+                (un elemento más que registros)
+        """
+        self._codes = codes
+        self._tables = tables
+        self._invoice_data = invoice_data
+        self._invoice_offsets = invoice_offsets
+
+    @classmethod
+    def from_columns(cls, location: pd.Series, requester: pd.Series,
+                     invoice: pd.Series, supplier: pd.Series) -> 'RecordStore':
+        """
+        Construye el almacén a partir de columnas normalizadas.
+
+        Args:
+            location: Columna de ubicaciones (Memo)
+            requester: Columna de solicitantes
+            invoice: Columna de facturas
+            supplier: Columna de proveedores (Name)
+
+        Returns:
+            Almacén con los registros en el orden de las columnas
+        """
+        encoded = [_encode_column(series) for series in (location, requester, supplier)]
+        invoice_data, invoice_offsets = _pack_strings(invoice)
+        return cls(
+            tuple(codes for codes, _ in encoded),
+            tuple(table for _, table in encoded),
+            invoice_data, invoice_offsets
+        )
+
+    def __len__(self) -> int:
+        return len(self._invoice_offsets) - 1
+
+    def _invoices(self, start: int, stop: int) -> List[str]:
+        offsets = self._invoice_offsets[start:stop + 1].tolist()
+        if not offsets:
+            return []
+        first, last = offsets[0], offsets[-1]
+        chunk = self._invoice_data[first:last]
+        text = chunk.decode('utf-8')
+        if len(text) == len(chunk):
+            # Solo ASCII: los desplazamientos en bytes sirven también para el texto
+            return [text[begin - first:end - first] for begin, end in zip(offsets, offsets[1:])]
+        data = self._invoice_data
+        return [data[begin:end].decode('utf-8') for begin, end in zip(offsets, offsets[1:])]
+
+    def materialize(self, start: int = 0, stop: Optional[int] = None) -> List[Record]:
+        """
+        Crea las tuplas de un rango de registros.
+
+        Args:
+            start: Primer registro
+            stop: Registro siguiente al último (por defecto, hasta el final)
+
+        Returns:
+            Lista de tuplas (ubicación, solicitante, factura, proveedor)
+        """
+        start, stop, _ = slice(start, stop).indices(len(self))
+        locations, requesters, suppliers = self._tables
+        location_codes, requester_codes, supplier_codes = (codes[start:stop].tolist() for codes in self._codes)
+        return list(zip(
+            map(locations.__getitem__, location_codes),
+            map(requesters.__getitem__, requester_codes),
+            self._invoices(start, stop),
+            map(suppliers.__getitem__, supplier_codes),
+        ))
+
+    def invoices(self) -> List[str]:
+        """
+        Obtiene las facturas de todos los registros.
+
+        Returns:
+            Lista de facturas en el orden de los registros
+        """
+        return self._invoices(0, len(self))
+
+    def directory_groups(self) -> Tuple[List[Tuple[str, str, str]], np.ndarray]:
+        """
+        Agrupa los registros por (ubicación, solicitante, proveedor) sin crear tuplas.
+
+        Returns:
+            (combinaciones distintas, índice de la combinación de cada registro)
+        """
+        locations, requesters, suppliers = self._tables
+        sizes = tuple(max(len(table), 1) for table in self._tables)
+        # Un entero por combinación: factorizar una columna es mucho más rápido que ordenar filas
+        combined = np.ravel_multi_index(tuple(codes.astype(np.int64) for codes in self._codes), sizes)
+        inverse, uniques = pd.factorize(combined)
+        location_codes, requester_codes, supplier_codes = (
+            codes.tolist() for codes in np.unravel_index(np.asarray(uniques, dtype=np.int64), sizes)
+        )
+        groups = list(zip(
+            map(locations.__getitem__, location_codes),
+            map(requesters.__getitem__, requester_codes),
+            map(suppliers.__getitem__, supplier_codes),
+        ))
+        return groups, inverse
+
+    def take(self, positions: np.ndarray) -> 'RecordStore':
+        """
+        Copia compacta de los registros indicados.
+
+        A diferencia de las rebanadas, no comparte el búfer de facturas del
+        almacén original, de modo que enviarla a otro proceso solo transfiere
+        sus propios registros.
+
+        Args:
+            positions: Posiciones de los registros, en el orden deseado
+
+        Returns:
+            Nuevo almacén con esos registros
+        """
+        positions = np.asarray(positions, dtype=np.int64)
+        starts = self._invoice_offsets[positions]
+        lengths = self._invoice_offsets[positions + 1] - starts
+        offsets = np.zeros(len(positions) + 1, dtype=np.int64)
+        np.cumsum(lengths, out=offsets[1:])
+        # Posición en el búfer original de cada byte del nuevo búfer
+        byte_positions = np.repeat(starts - offsets[:-1], lengths) + np.arange(offsets[-1])
+        data = np.frombuffer(self._invoice_data, dtype=np.uint8)[byte_positions].tobytes()
+        return RecordStore(tuple(codes[positions] for codes in self._codes), self._tables, data, offsets)
+
+    def batches(self, size: int) -> Iterator[List[Record]]:
+        """
+        Itera los registros en bloques materializados.
+
+        Args:
+            size: Registros por bloque
+
+        Yields:
+            Listas de tuplas de como máximo size registros
+        """
+        size = max(1, size)
+        for start in range(0, len(self), size):
+            yield self.materialize(start, start + size)
+
+    def __iter__(self) -> Iterator[Record]:
+        for batch in self.batches(_ITER_BLOCK):
+            yield from batch
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Record, 'RecordStore', List[Record]]:
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return [self[position] for position in range(start, stop, step)]
+            stop = max(start, stop)
+            # Rebanada sin copias: los desplazamientos son absolutos dentro del búfer compartido
+            return RecordStore(
+                tuple(codes[start:stop] for codes in self._codes), self._tables,
+                self._invoice_data, self._invoice_offsets[start:stop + 1]
+            )
+        position = range(len(self))[index]
+        return self.materialize(position, position + 1)[0]
+
+    @property
+    def nbytes(self) -> int:
+        """Memoria aproximada ocupada por el almacén, en bytes."""
+        table_bytes = sum(
+            sys.getsizeof(table) + sum(sys.getsizeof(value) for value in table)
+            for table in self._tables
+        )
+        return (sum(codes.nbytes for codes in self._codes) + table_bytes
+                + len(self._invoice_data) + self._invoice_offsets.nbytes)
+
+    def to_frame(self, names: List[str]) -> pd.DataFrame:
+        """
+        Convierte el almacén en un DataFrame de pandas.
+
+        Args:
+            names: Nombres de las columnas (ubicación, solicitante, factura, proveedor)
+
+        Returns:
+            DataFrame con ubicación, solicitante y proveedor como categóricas
+        """
+        location, requester, supplier = (
+            pd.Categorical.from_codes(codes, table) for codes, table in zip(self._codes, self._tables)
+        )
+        return pd.DataFrame(dict(zip(names, (location, requester, self._invoices(0, len(self)), supplier))))
+
+    def __repr__(self) -> str:
+        locations, requesters, suppliers = self._tables
+        return (f"RecordStore({len(self)} registros, {len(locations)} ubicaciones, "
+                f"{len(requesters)} solicitantes, {len(suppliers)} proveedores)")
@@ -64,6 +64,7 @@ setup(
         'console_scripts': [
             'purchase-order-organizer=purchase_order_organizer.main:main',
             'poo=purchase_order_organizer.main:main',  # Comando corto
+            'poo-cli=purchase_order_organizer.cli:main',  # Sin interfaz gráfica
         ],
     },
     include_package_data=True,
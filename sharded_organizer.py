@@ -0,0 +1,293 @@
+"""
+Organización en varios procesos para aprovechar todos los núcleos.
+
+Con hilos, la parte en Python de la organización (construir registros,
+limpiar nombres, unir rutas) queda limitada por el GIL. Aquí los registros,
+el índice de PDFs y el manifiesto se leen una sola vez; los registros se
+reparten en fragmentos (ver sharding) y cada fragmento se organiza en su
+propio proceso con un FileOrganizer independiente, que recibe solo sus
+registros, sus PDFs y sus entradas del manifiesto. Al terminar se combinan
+las estadísticas y los manifiestos de todos los fragmentos.
+
+Para ejecuciones repartidas entre varias máquinas que comparten el
+directorio de salida, cada nodo organiza un fragmento (FileOrganizer con
+shard=(i, N)) y guarda sus estadísticas; merge_shards combina después las
+estadísticas y los manifiestos de todos los nodos en un único informe.
+"""
+
+import contextlib
+import json
+import os
+from dataclasses import asdict
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import pandas as pd
+
+from config import Config
+from data_backends import RECORD_COLUMNS
+from data_handler import DataHandler
+from exceptions import OutputDirectoryError, PDFDirectoryError
+from file_organizer import FileOrganizer, OrganizationStats
+from manifest import RunManifest
+from pdf_index import PDFIndex
+from progress import CallbackReporter, ConsoleReporter, ProgressEvent, ProgressReporter
+from record_store import RecordStore
+from sharding import partition_store
+
+Record = Tuple[str, str, str, str]
+
+
+def _organize_shard(records: RecordStore, pdf_index: PDFIndex, previous: Optional[Dict[str, Dict]],
+                    output_directory: str, shard: Tuple[int, int],
+                    options: Dict) -> Tuple[OrganizationStats, List[ProgressEvent]]:
+    """
+    Organiza un fragmento dentro de un proceso del pool.
+
+    Recibe solo sus registros, los PDFs de sus facturas y las entradas del
+    manifiesto de sus directorios, de modo que no vuelve a leer el archivo
+    de datos, el directorio de PDFs ni el manifiesto.
+
+    Returns:
+        (estadísticas del fragmento, eventos de error de copia)
+    """
+    errors: List[ProgressEvent] = []
+
+    def collect_error(event: ProgressEvent) -> None:
+        if event.kind == 'file_error':
+            errors.append(event)
+
+    organizer = FileOrganizer(records, str(pdf_index.directory), output_directory, shard=shard,
+                              progress=CallbackReporter(collect_error), **options)
+    organizer.pdf_index = pdf_index
+    if previous is not None:
+        organizer.manifest = RunManifest(organizer.output_directory, shard).load(previous)
+    # El proceso principal informa del avance por fragmento y de los errores devueltos
+    with open(os.devnull, 'w') as devnull, contextlib.redirect_stdout(devnull):
+        return organizer.organize_files(), errors
+
+
+def _print_combined_summary(stats: OrganizationStats, shard_count: int) -> None:
+    print(f"\n=== RESUMEN ({shard_count} fragmentos) ===")
+    print(f"Carpetas creadas: {stats.folders_created}")
+    print(f"Archivos copiados exitosamente: {stats.files_moved}")
+    print(f"Archivos no encontrados: {stats.files_not_found}")
+    print(f"Archivos sin cambios (omitidos): {stats.files_skipped}")
+    print(f"Total de registros procesados: {stats.total_records}")
+    print(f"PDFs sin referencia en los datos: {stats.unmatched_pdfs}")
+    if stats.bytes_saved:
+        print(f"Espacio ahorrado por deduplicación: {stats.bytes_saved / (1024 * 1024):.1f} MB")
+
+
+def merge_shards(output_directory: Union[str, Path]) -> Tuple[OrganizationStats, Dict[int, OrganizationStats]]:
+    """
+    Combina los resultados de una ejecución repartida entre nodos.
+
+    Lee las estadísticas guardadas por cada fragmento (ver
+    FileOrganizer.save_shard_stats), combina los manifiestos de los
+    fragmentos en el principal y escribe Config.SHARD_REPORT_FILENAME con el
+    resumen combinado y el de cada fragmento. Los archivos de estadísticas
+    de los fragmentos se eliminan una vez combinados.
+
+    Args:
+        output_directory: Directorio de salida compartido por los nodos
+
+    Returns:
+        (estadísticas combinadas, estadísticas por índice de fragmento)
+
+    Raises:
+        OutputDirectoryError: Si no hay fragmentos, pertenecen a repartos
+            distintos o falta alguno
+    """
+    output_directory = Path(output_directory)
+    pattern = f"{Path(Config.SHARD_STATS_FILENAME).stem}.shard-*{Path(Config.SHARD_STATS_FILENAME).suffix}"
+    shard_data = []
+    for path in sorted(output_directory.glob(pattern)):
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                shard_data.append((path, json.load(f)))
+        except (OSError, ValueError) as e:
+            raise OutputDirectoryError(f"No se pudieron leer las estadísticas de {path.name}: {e}") from e
+    if not shard_data:
+        raise OutputDirectoryError(f"No hay estadísticas de fragmentos en {output_directory}")
+
+    shard_counts = {data['shard'][1] for _, data in shard_data}
+    if len(shard_counts) > 1:
+        raise OutputDirectoryError(
+            f"Las estadísticas pertenecen a repartos distintos: {', '.join(map(str, sorted(shard_counts)))} fragmentos"
+        )
+    shard_count = shard_counts.pop()
+    missing = set(range(shard_count)) - {data['shard'][0] for _, data in shard_data}
+    if missing:
+        raise OutputDirectoryError(
+            f"Faltan fragmentos por terminar: {', '.join(f'{index + 1}/{shard_count}' for index in sorted(missing))}"
+        )
+
+    shard_stats: Dict[int, OrganizationStats] = {}
+    unmatched = None
+    for _, data in shard_data:
+        shard_stats[data['shard'][0]] = OrganizationStats(**data['stats'])
+        # Un PDF queda sin referencia solo si ningún fragmento lo usó
+        names = set(data['unmatched'])
+        unmatched = names if unmatched is None else unmatched & names
+    stats = OrganizationStats.combine(shard_stats.values())
+    stats.unmatched_pdfs = len(unmatched)
+
+    RunManifest.merge(output_directory)
+    report = {
+        'shard_count': shard_count,
+        'shard_by': shard_data[0][1].get('shard_by'),
+        'stats': asdict(stats),
+        'shards': {str(index + 1): asdict(shard_stats[index]) for index in sorted(shard_stats)},
+    }
+    with open(output_directory / Config.SHARD_REPORT_FILENAME, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2, ensure_ascii=False)
+    for path, _ in shard_data:
+        path.unlink()
+    return stats, shard_stats
+
+
+def print_merge_summary(stats: OrganizationStats, shard_stats: Dict[int, OrganizationStats]) -> None:
+    """
+    Imprime el resultado de merge_shards.
+
+    Args:
+        stats: Estadísticas combinadas
+        shard_stats: Estadísticas por índice de fragmento
+    """
+    for index in sorted(shard_stats):
+        shard = shard_stats[index]
+        print(f"✅ Fragmento {index + 1}/{len(shard_stats)}: {shard.total_records} registros, "
+              f"{shard.files_moved} copiados, {shard.files_not_found} no encontrados")
+    _print_combined_summary(stats, len(shard_stats))
+
+
+class ShardedOrganizer:
+    """Organiza un archivo de datos repartiendo los registros entre procesos."""
+
+    def __init__(self, data_source: Union[str, DataHandler, Iterable[Record]],
+                 pdf_directory: str, output_directory: str,
+                 processes: Optional[int] = None,
+                 shard_by: str = Config.SHARD_STRATEGY,
+                 workers: int = Config.DEFAULT_WORKERS,
+                 max_inflight_bytes: Optional[int] = Config.MAX_INFLIGHT_BYTES,
+                 placement_mode: str = Config.DEFAULT_PLACEMENT_MODE,
+                 use_manifest: bool = Config.USE_MANIFEST,
+                 dedup: bool = Config.USE_DEDUP,
+                 use_cache: bool = Config.USE_RECORD_CACHE,
+                 backend: str = Config.DATA_BACKEND,
+                 progress: Optional[ProgressReporter] = None,
+                 chunk_size: int = Config.CHUNK_SIZE,
+                 write_report: bool = Config.WRITE_METRICS_REPORT):
+        """
+        Inicializa la organización en varios procesos.
+
+        Args:
+            data_source: Ruta del archivo de datos, DataHandler o registros
+            pdf_directory: Directorio con los PDFs originales
+            output_directory: Directorio donde crear la estructura
+            processes: Procesos (por defecto, uno por núcleo)
+            shard_by: 'location' o 'directory' (ver sharding)
+            workers: Hilos de copia dentro de cada proceso
+            max_inflight_bytes: Máximo de bytes copiándose a la vez en cada proceso
+            placement_mode: Modo de colocación de archivos
+            use_manifest: Si se usa el manifiesto incremental
+            dedup: Si los PDFs idénticos se copian una sola vez (dentro de cada fragmento)
+            use_cache: Si se usa la caché de registros normalizados
+            backend: Biblioteca de DataFrames con la que se lee el archivo
+            progress: Reporter que recibe los errores de copia de los fragmentos
+                (por defecto, consola)
+            chunk_size: Registros por bloque dentro de cada proceso
+            write_report: Si cada fragmento guarda su informe de métricas
+                (ver FileOrganizer.save_report)
+        """
+        self.data_source = data_source
+        self.pdf_directory = Path(pdf_directory)
+        self.output_directory = Path(output_directory)
+        self.processes = max(1, processes or os.cpu_count() or 1)
+        self.shard_by = shard_by
+        self.use_manifest = use_manifest
+        self.dedup = dedup
+        self.use_cache = use_cache
+        self.backend = backend
+        self.progress = progress if progress is not None else ConsoleReporter()
+        self.options = dict(
+            workers=workers,
+            max_inflight_bytes=max_inflight_bytes,
+            placement_mode=placement_mode,
+            use_manifest=use_manifest,
+            dedup=dedup,
+            shard_by=shard_by,
+            chunk_size=chunk_size,
+            write_report=write_report
+        )
+        self.shard_stats: Dict[int, OrganizationStats] = {}
+        self.stats = OrganizationStats()
+
+    def _load_records(self) -> RecordStore:
+        if isinstance(self.data_source, DataHandler):
+            return self.data_source.get_record_store()
+        if isinstance(self.data_source, (str, os.PathLike)):
+            handler = DataHandler(str(self.data_source), use_cache=self.use_cache, backend=self.backend)
+            handler.validate_columns()
+            return handler.get_record_store()
+        frame = pd.DataFrame(list(self.data_source), columns=RECORD_COLUMNS, dtype=object)
+        return RecordStore.from_columns(*(frame[column] for column in RECORD_COLUMNS))
+
+    def _shard_manifests(self, folders: Dict[str, int]) -> List[Optional[Dict[str, Dict]]]:
+        # El manifiesto principal se lee una vez y cada fragmento recibe solo sus directorios
+        if not self.use_manifest:
+            return [None] * self.processes
+        shard_entries: List[Dict[str, Dict]] = [{} for _ in range(self.processes)]
+        for destination, entry in RunManifest(self.output_directory).load().previous.items():
+            index = folders.get(destination.rpartition('/')[0])
+            if index is not None:
+                shard_entries[index][destination] = entry
+        return shard_entries
+
+    def organize_all(self) -> OrganizationStats:
+        """
+        Organiza todos los fragmentos en paralelo.
+
+        Returns:
+            Estadísticas combinadas de todos los fragmentos
+        """
+        print(f"=== INICIANDO ORGANIZACIÓN EN {self.processes} PROCESOS ===")
+        if not self.pdf_directory.is_dir():
+            raise PDFDirectoryError(f"El directorio de PDFs no existe: {self.pdf_directory}")
+        records = self._load_records()
+        shards, folders = partition_store(records, self.processes, self.shard_by)
+        pdf_index = PDFIndex.build(self.pdf_directory)
+        manifests = self._shard_manifests(folders)
+        self.progress.start(self.output_directory)
+
+        try:
+            with ProcessPoolExecutor(max_workers=self.processes) as pool:
+                futures = {
+                    pool.submit(_organize_shard, shard_records, pdf_index.subset(shard_records.invoices()),
+                                manifests[index], str(self.output_directory),
+                                (index, self.processes), self.options): index
+                    for index, shard_records in enumerate(shards) if len(shard_records)
+                }
+                for future in as_completed(futures):
+                    index = futures[future]
+                    stats, errors = future.result()
+                    self.shard_stats[index] = stats
+                    for event in errors:
+                        self.progress.emit(event)
+                    print(f"✅ Fragmento {index + 1}/{self.processes}: {stats.total_records} registros, "
+                          f"{stats.files_moved} copiados, {stats.files_not_found} no encontrados"
+                          + (f", {len(errors)} errores" if errors else ""))
+        finally:
+            self.progress.finish()
+
+        if self.use_manifest:
+            RunManifest.merge(self.output_directory)
+        self.stats = OrganizationStats.combine(self.shard_stats.values())
+        self.stats.unmatched_pdfs = len(pdf_index.unmatched())
+        return self.stats
+
+    def print_summary(self) -> None:
+        """Imprime el resumen combinado de todos los fragmentos."""
+        _print_combined_summary(self.stats, len(self.shard_stats))
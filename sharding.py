@@ -0,0 +1,145 @@
+"""
+Reparto determinista de los registros en fragmentos (shards).
+
+Cada registro se asigna a un fragmento según su ubicación (Memo) o según
+su directorio de destino completo. El hash es estable entre procesos y
+máquinas (CRC32 de los nombres de carpeta que produce clean_filename), de
+modo que varios procesos o nodos que leen el mismo archivo de datos
+obtienen siempre el mismo reparto y nunca escriben en el mismo directorio
+de proveedor, aunque dos valores distintos den la misma carpeta.
+"""
+
+import zlib
+from pathlib import Path
+from typing import Dict, Iterable, List, Tuple
+
+import numpy as np
+
+from record_store import RecordStore
+from utils import clean_filename
+
+Record = Tuple[str, str, str, str]
+
+# 'location': todo lo de una ubicación va al mismo fragmento (ningún directorio compartido).
+# 'directory': reparto por directorio de proveedor, más equilibrado cuando hay pocas ubicaciones.
+SHARD_STRATEGIES: Tuple[str, ...] = ('location', 'directory')
+
+
+def parse_shard_spec(spec: str) -> Tuple[int, int]:
+    """
+    Interpreta una especificación de fragmento de la forma "i/N".
+
+    Args:
+        spec: Fragmento i (desde 1) de N, por ejemplo "2/4"
+
+    Returns:
+        (índice desde 0, total de fragmentos)
+
+    Raises:
+        ValueError: Si la especificación no es válida
+    """
+    index, separator, count = spec.partition('/')
+    try:
+        shard_index, shard_count = int(index), int(count)
+    except ValueError:
+        raise ValueError(f"Fragmento no válido: {spec!r} (se espera i/N, por ejemplo 2/4)") from None
+    if not separator or shard_count < 1 or not 1 <= shard_index <= shard_count:
+        raise ValueError(f"Fragmento no válido: {spec!r} (se espera i/N con 1 <= i <= N)")
+    return shard_index - 1, shard_count
+
+
+def shard_file_path(output_directory: Path, filename: str, shard: Tuple[int, int]) -> Path:
+    """
+    Ruta de un archivo propio de un fragmento dentro del directorio de salida.
+
+    Los nodos que comparten el directorio de salida escriben cada uno su
+    propio archivo, que después se combina (ver sharded_organizer.merge_shards).
+
+    Args:
+        output_directory: Directorio de salida
+        filename: Nombre del archivo común (manifiesto, estadísticas, informe)
+        shard: (índice desde 0, total de fragmentos)
+
+    Returns:
+        Ruta del archivo del fragmento, por ejemplo "stats.shard-0-of-4.json"
+    """
+    name = Path(filename)
+    return Path(output_directory) / f"{name.stem}.shard-{shard[0]}-of-{shard[1]}{name.suffix}"
+
+
+def shard_of(record: Record, shard_count: int, strategy: str = 'location') -> int:
+    """
+    Calcula el fragmento de un registro.
+
+    Args:
+        record: Tupla (ubicación, solicitante, factura, proveedor)
+        shard_count: Número total de fragmentos
+        strategy: 'location' o 'directory'
+
+    Returns:
+        Índice del fragmento, entre 0 y shard_count - 1
+    """
+    parts = (record[0],) if strategy == 'location' else (record[0], record[1], record[3])
+    # Se usan los nombres de carpeta en disco: "Sede:1" y "Sede_1" son la misma carpeta.
+    # casefold, porque en Windows y macOS tampoco se distinguen mayúsculas de minúsculas.
+    key = "\0".join(clean_filename(str(part)).casefold() for part in parts)
+    return zlib.crc32(key.encode('utf-8')) % shard_count
+
+
+def partition_records(records: Iterable[Record], shard_count: int,
+                      strategy: str = 'location') -> List[List[Record]]:
+    """
+    Reparte los registros entre fragmentos.
+
+    Args:
+        records: Tuplas (ubicación, solicitante, factura, proveedor)
+        shard_count: Número total de fragmentos
+        strategy: 'location' o 'directory'
+
+    Returns:
+        Una lista de registros por fragmento, conservando el orden original
+    """
+    shards: List[List[Record]] = [[] for _ in range(shard_count)]
+    for record in records:
+        shards[shard_of(record, shard_count, strategy)].append(record)
+    return shards
+
+
+def partition_store(store: RecordStore, shard_count: int,
+                    strategy: str = 'location') -> Tuple[List[RecordStore], Dict[str, int]]:
+    """
+    Reparte un RecordStore entre fragmentos sin crear sus tuplas.
+
+    El fragmento se calcula una vez por directorio de proveedor distinto, no
+    por registro, y cada fragmento es una copia compacta con solo sus
+    registros (ver RecordStore.take), lista para enviarse a otro proceso.
+
+    Args:
+        store: Registros a repartir
+        shard_count: Número total de fragmentos
+        strategy: 'location' o 'directory'
+
+    Returns:
+        (un almacén por fragmento conservando el orden original,
+        fragmento de cada directorio de proveedor "ubicación/solicitante/proveedor"
+        con los nombres de carpeta en disco)
+    """
+    groups, group_of_record = store.directory_groups()
+    by_location: Dict[str, int] = {}
+    group_shards: List[int] = []
+    for location, requester, supplier in groups:
+        if strategy == 'location':
+            # Con este criterio basta un cálculo por ubicación
+            shard = by_location.get(location)
+            if shard is None:
+                shard = by_location[location] = shard_of((location,), shard_count, strategy)
+        else:
+            shard = shard_of((location, requester, '', supplier), shard_count, strategy)
+        group_shards.append(shard)
+    record_shards = np.asarray(group_shards, dtype=np.int64)[group_of_record]
+    shards = [store.take(np.flatnonzero(record_shards == index)) for index in range(shard_count)]
+    folders = {
+        f"{clean_filename(location)}/{clean_filename(requester)}/{clean_filename(supplier)}": shard
+        for (location, requester, supplier), shard in zip(groups, group_shards)
+    }
+    return shards, folders
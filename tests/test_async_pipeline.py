@@ -0,0 +1,100 @@
+"""
+Organización asíncrona: mismo resultado que la síncrona, sin bloquear el bucle de eventos.
+"""
+
+import asyncio
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from file_organizer import FileOrganizer
+from progress import CallbackReporter
+
+
+class AsyncPipelineTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self.pdfs = self.root / 'pdfs'
+        self.pdfs.mkdir()
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+        for number in range(20):
+            (self.pdfs / f'F{number}.pdf').write_bytes(b'%PDF ' + bytes([number]))
+        # La misma factura aparece en bloques distintos y algunas no tienen PDF
+        self.records = [(f'Sede{number % 3}', f'Sol{number % 4}', f'F{number % 25}', 'Prov')
+                        for number in range(300)]
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    def organizer(self, output, **options):
+        return FileOrganizer(self.records, str(self.pdfs), str(self.root / output), chunk_size=40,
+                             progress=CallbackReporter(lambda event: None), **options)
+
+    def output_files(self, output):
+        directory = self.root / output
+        return sorted(path.relative_to(directory).as_posix() for path in directory.rglob('*.pdf'))
+
+    def test_async_matches_sync(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            expected = self.organizer('sync').organize_files()
+            stats = asyncio.run(self.organizer('async').organize_files_async(
+                placement_workers=4, load_workers=2, directory_workers=3))
+
+        for field in ('total_records', 'files_moved', 'files_not_found', 'files_skipped', 'folders_created'):
+            self.assertEqual(getattr(stats, field), getattr(expected, field), field)
+        self.assertEqual(self.output_files('async'), self.output_files('sync'))
+
+    def test_async_rerun_skips_everything(self):
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = asyncio.run(self.organizer('out').organize_files_async(placement_workers=4))
+            second = asyncio.run(self.organizer('out').organize_files_async(placement_workers=4))
+
+        self.assertEqual(second.files_moved, 0)
+        self.assertEqual(second.files_skipped, first.files_moved)
+
+    def test_cancel_does_not_block_event_loop(self):
+        organizer = self.organizer('out')
+        copy_invoice = organizer._copy_invoice
+        started = threading.Event()
+
+        def slow_copy(*args):
+            started.set()
+            time.sleep(0.2)
+            copy_invoice(*args)
+
+        organizer._copy_invoice = slow_copy
+
+        async def main():
+            job = asyncio.ensure_future(organizer.organize_files_async(placement_workers=2))
+            while not started.is_set():
+                await asyncio.sleep(0.01)
+            job.cancel()
+            # El bucle sigue atendiendo otras tareas mientras terminan las copias en curso
+            ticks = 0
+            while not job.done():
+                ticks += 1
+                await asyncio.sleep(0.01)
+            with self.assertRaises(asyncio.CancelledError):
+                await job
+            return ticks
+
+        with contextlib.redirect_stdout(io.StringIO()):
+            ticks = asyncio.run(main())
+        self.assertGreater(ticks, 1)
+        self.assertLess(organizer.stats.files_moved, len(self.records))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,98 @@
+"""
+Bibliotecas de datos: pandas, arrow y polars deben producir los mismos registros.
+
+Las celdas se leen como texto, así que los ceros a la izquierda, los
+valores con forma de número y los textos que parecen nulos se conservan
+igual en todas las bibliotecas.
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from data_backends import DATA_BACKENDS, create_backend
+from data_handler import DataHandler
+from exceptions import DataFileError
+
+ROWS = [
+    {'Memo': '0012', 'Nombre del Solicitante': 'Ana', 'Factura': '00123', 'Name': 'Proveedor A', 'Extra': 'x'},
+    {'Memo': 'Sede Norte', 'Nombre del Solicitante': '', 'Factura': '3.0', 'Name': 'Proveedor B', 'Extra': ''},
+    {'Memo': 'NaN', 'Nombre del Solicitante': 'Luis', 'Factura': 'FAC-1', 'Name': '', 'Extra': 'y'},
+    {'Memo': 'Sede Sur', 'Nombre del Solicitante': 'José Ñúñez', 'Factura': '1e3', 'Name': 'Proveedor A', 'Extra': 'z'},
+    {'Memo': '', 'Nombre del Solicitante': 'Ana', 'Factura': 'FAC-2', 'Name': 'Proveedor C', 'Extra': ''},
+]
+
+
+class BackendEquivalenceTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+        frame = pd.DataFrame(ROWS, dtype=object)
+        self.csv = self.root / 'datos.csv'
+        frame.to_csv(self.csv, index=False)
+        self.xlsx = self.root / 'datos.xlsx'
+        frame.to_excel(self.xlsx, index=False)
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    def available_backends(self):
+        backends = []
+        for name in DATA_BACKENDS:
+            if name == 'auto':
+                continue
+            try:
+                create_backend(name)
+            except DataFileError:
+                continue
+            backends.append(name)
+        return backends
+
+    def read(self, path, backend, use_cache=False):
+        handler = DataHandler(str(path), use_cache=use_cache, backend=backend)
+        with contextlib.redirect_stdout(io.StringIO()):
+            handler.validate_columns()
+            return handler.get_processed_records(), list(handler.get_record_store())
+
+    def test_backends_produce_the_same_records(self):
+        for path in (self.csv, self.xlsx):
+            expected, expected_store = self.read(path, 'pandas')
+            self.assertEqual(len(expected), len(ROWS))
+            self.assertEqual(expected[0], ('0012', 'Ana', '00123', 'Proveedor A'))
+            self.assertEqual(expected[1], ('Sede Norte', 'No_especificado', '3.0', 'Proveedor B'))
+            self.assertEqual(expected_store, expected)
+            for backend in self.available_backends():
+                with self.subTest(file=path.suffix, backend=backend):
+                    records, store = self.read(path, backend)
+                    self.assertEqual(records, expected)
+                    self.assertEqual(store, expected)
+
+    def test_streaming_matches_full_read(self):
+        expected, _ = self.read(self.csv, 'pandas')
+        handler = DataHandler(str(self.csv), use_cache=False)
+        with contextlib.redirect_stdout(io.StringIO()):
+            self.assertEqual(list(handler.iter_records(chunk_size=2)), expected)
+
+    def test_cached_records_match_fresh_read(self):
+        for backend in self.available_backends():
+            with self.subTest(backend=backend):
+                fresh, _ = self.read(self.csv, backend, use_cache=True)
+                cached, cached_store = self.read(self.csv, backend, use_cache=True)
+                self.assertEqual(cached, fresh)
+                self.assertEqual(cached_store, fresh)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,80 @@
+"""
+Regresión: una ejecución repetida con deduplicación no debe modificar otras salidas.
+
+Las apariciones deduplicadas son enlaces duros a la primera copia; si el
+origen de esa primera copia cambia, volver a copiarlo no puede escribir
+sobre el inodo compartido.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from file_organizer import FileOrganizer
+from progress import CallbackReporter
+
+
+class DedupRerunTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self.pdfs = self.root / 'pdfs'
+        self.output = self.root / 'out'
+        self.pdfs.mkdir()
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    def organize(self, records, placement_mode='copy', dedup=True):
+        organizer = FileOrganizer(records, str(self.pdfs), str(self.output), dedup=dedup,
+                                  placement_mode=placement_mode, progress=CallbackReporter(lambda event: None))
+        with contextlib.redirect_stdout(io.StringIO()):
+            return organizer.organize_files()
+
+    def write_pdf(self, name, content, mtime):
+        path = self.pdfs / name
+        path.write_bytes(content)
+        os.utime(path, (mtime, mtime))
+
+    def test_changed_source_does_not_overwrite_deduplicated_copy(self):
+        self.write_pdf('A.pdf', b'%PDF original', 1_000_000)
+        self.write_pdf('B.pdf', b'%PDF original', 1_000_000)
+        records = [('Sede', 'Ana', 'A', 'Prov'), ('Sede', 'Ana', 'B', 'Prov')]
+        first = self.organize(records)
+        self.assertEqual(first.placement_modes, {'copy': 1, 'dedup': 1})
+
+        self.write_pdf('A.pdf', b'%PDF modificado', 2_000_000)
+        second = self.organize(records)
+
+        destination = self.output / 'Sede' / 'Ana' / 'Prov'
+        self.assertEqual(second.files_skipped, 1)
+        self.assertEqual((destination / 'A.pdf').read_bytes(), b'%PDF modificado')
+        self.assertEqual((destination / 'B.pdf').read_bytes(), b'%PDF original')
+
+    def test_fan_out_copy_replaces_existing_links(self):
+        self.write_pdf('A.pdf', b'%PDF original', 1_000_000)
+        records = [('Sede', 'Ana', 'A', 'Prov'), ('Sede', 'Luis', 'A', 'Prov')]
+        self.organize(records, placement_mode='symlink', dedup=False)
+
+        # La segunda aparición sale de la primera copia (fan-out) y no debe escribir a través del enlace
+        self.write_pdf('A.pdf', b'%PDF modificado', 2_000_000)
+        self.organize(records, placement_mode='copy', dedup=False)
+
+        fan_out = self.output / 'Sede' / 'Luis' / 'Prov' / 'A.pdf'
+        self.assertFalse(fan_out.is_symlink())
+        self.assertEqual(fan_out.read_bytes(), b'%PDF modificado')
+
+
+if __name__ == '__main__':
+    unittest.main()
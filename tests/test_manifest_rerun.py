@@ -0,0 +1,90 @@
+"""
+Manifiesto incremental: una ejecución repetida solo coloca lo que cambió.
+
+Solo cuentan las entradas de ejecuciones anteriores, de modo que el
+resultado de una ejecución nueva no depende del tamaño de bloque ni del
+número de hilos de copia.
+"""
+
+import contextlib
+import io
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from file_organizer import FileOrganizer
+from progress import CallbackReporter
+
+
+class ManifestRerunTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self.pdfs = self.root / 'pdfs'
+        self.output = self.root / 'out'
+        self.pdfs.mkdir()
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+        for number in range(10):
+            self.write_pdf(f'F{number}.pdf', b'%PDF ' + bytes([number]), 1_000_000)
+        # Cada destino aparece varias veces y en bloques distintos
+        self.records = [('Sede', f'Sol{number % 2}', f'F{number % 10}', 'Prov') for number in range(60)]
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    def organize(self, **options):
+        organizer = FileOrganizer(self.records, str(self.pdfs), str(self.output),
+                                  progress=CallbackReporter(lambda event: None), **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            return organizer.organize_files()
+
+    def write_pdf(self, name, content, mtime):
+        path = self.pdfs / name
+        path.write_bytes(content)
+        os.utime(path, (mtime, mtime))
+
+    def test_rerun_skips_unchanged_files(self):
+        first = self.organize()
+        second = self.organize()
+
+        self.assertEqual((first.files_moved, first.files_skipped), (60, 0))
+        self.assertEqual((second.files_moved, second.files_skipped), (0, 60))
+
+    def test_rerun_places_changed_and_missing_files(self):
+        self.organize()
+        self.write_pdf('F1.pdf', b'%PDF modificado', 2_000_000)
+        (self.output / 'Sede' / 'Sol0' / 'Prov' / 'F2.pdf').unlink()
+
+        stats = self.organize()
+
+        # F1 (siempre en Sol1) y F2 (siempre en Sol0) aparecen 6 veces cada una
+        self.assertEqual((stats.files_moved, stats.files_skipped), (12, 48))
+        self.assertEqual((self.output / 'Sede' / 'Sol1' / 'Prov' / 'F1.pdf').read_bytes(), b'%PDF modificado')
+        self.assertTrue((self.output / 'Sede' / 'Sol0' / 'Prov' / 'F2.pdf').exists())
+
+    def test_fresh_run_does_not_depend_on_chunks_or_workers(self):
+        expected = self.organize()
+        for options in ({'chunk_size': 7}, {'chunk_size': 7, 'workers': 4}):
+            with self.subTest(**options):
+                (self.output / Config.MANIFEST_FILENAME).unlink()
+                stats = self.organize(**options)
+                self.assertEqual((stats.files_moved, stats.files_skipped),
+                                 (expected.files_moved, expected.files_skipped))
+
+    def test_without_manifest_everything_is_placed_again(self):
+        self.organize()
+        stats = self.organize(use_manifest=False)
+
+        self.assertEqual((stats.files_moved, stats.files_skipped), (60, 0))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,145 @@
+"""
+Reparto en fragmentos: varios procesos o nodos deben dar el mismo resultado que uno solo.
+"""
+
+import contextlib
+import io
+import json
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+
+import pandas as pd
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from data_backends import RECORD_COLUMNS
+from exceptions import OutputDirectoryError
+from file_organizer import FileOrganizer
+from progress import CallbackReporter
+from record_store import RecordStore
+from sharded_organizer import ShardedOrganizer, merge_shards
+from sharding import partition_records, partition_store
+from utils import clean_filename
+
+
+class ShardingTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self.pdfs = self.root / 'pdfs'
+        self.output = self.root / 'out'
+        self.pdfs.mkdir()
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+        for number in range(12):
+            (self.pdfs / f'F{number}.pdf').write_bytes(b'%PDF ' + bytes([number]))
+        # "Sede:1" y "Sede_1" son la misma carpeta y deben ir al mismo fragmento
+        locations = ['Sede:1', 'Sede_1', 'Norte', 'Sur', 'Este']
+        self.records = [(locations[number % 5], f'Sol{number % 3}', f'F{number % 15}', f'Prov{number % 2}')
+                        for number in range(90)]
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    def organize(self, **options):
+        organizer = FileOrganizer(self.records, str(self.pdfs), str(self.output),
+                                  progress=CallbackReporter(lambda event: None), **options)
+        with contextlib.redirect_stdout(io.StringIO()):
+            organizer.organize_files()
+        return organizer
+
+    def output_files(self):
+        return sorted(path.relative_to(self.output).as_posix() for path in self.output.rglob('*.pdf'))
+
+    def manifest_destinations(self, output=None):
+        with open((output or self.output) / Config.MANIFEST_FILENAME, encoding='utf-8') as f:
+            return sorted(json.loads(line)['destination'] for line in f)
+
+    def test_partition_store_matches_partition_records(self):
+        frame = pd.DataFrame(self.records, columns=RECORD_COLUMNS, dtype=object)
+        store = RecordStore.from_columns(*(frame[column] for column in RECORD_COLUMNS))
+        for strategy in ('location', 'directory'):
+            with self.subTest(strategy=strategy):
+                shards, folders = partition_store(store, 3, strategy)
+                self.assertEqual([list(shard) for shard in shards], partition_records(self.records, 3, strategy))
+                # Cada directorio de proveedor, con su nombre en disco, pertenece al fragmento de sus registros
+                for index, shard in enumerate(shards):
+                    for location, requester, _, supplier in shard:
+                        self.assertEqual(folders[f"{clean_filename(location)}/{requester}/{supplier}"], index)
+
+    def test_processes_match_single_process(self):
+        single = self.organize().stats
+        expected_files = self.output_files()
+        expected_manifest = self.manifest_destinations()
+        for path in self.output.iterdir():
+            if path.is_file():
+                path.unlink()
+
+        errors = []
+        sharded = ShardedOrganizer(self.records, str(self.pdfs), str(self.output), processes=3,
+                                   progress=CallbackReporter(errors.append))
+        with contextlib.redirect_stdout(io.StringIO()):
+            stats = sharded.organize_all()
+
+        self.assertEqual(errors, [])
+        self.assertEqual(stats.total_records, single.total_records)
+        self.assertEqual(stats.files_not_found, single.files_not_found)
+        self.assertEqual(stats.unmatched_pdfs, single.unmatched_pdfs)
+        self.assertEqual(self.output_files(), expected_files)
+        # Los manifiestos de los fragmentos se combinan en el principal y se eliminan
+        self.assertEqual(self.manifest_destinations(), expected_manifest)
+        self.assertEqual(list(self.output.glob('*.shard-*')), [])
+
+    def test_processes_rerun_skips_everything(self):
+        sharded = ShardedOrganizer(self.records, str(self.pdfs), str(self.output), processes=3,
+                                   progress=CallbackReporter(lambda event: None))
+        with contextlib.redirect_stdout(io.StringIO()):
+            first = sharded.organize_all()
+            second = sharded.organize_all()
+
+        self.assertEqual(second.files_moved, 0)
+        self.assertEqual(second.files_skipped, first.files_moved)
+
+    def test_nodes_merge_into_single_result(self):
+        single_output = self.output
+        single = self.organize().stats
+        expected_files = self.output_files()
+        self.output = self.root / 'nodes'
+
+        for index in range(3):
+            self.organize(shard=(index, 3)).save_shard_stats()
+        stats, shard_stats = merge_shards(self.output)
+
+        self.assertEqual(len(shard_stats), 3)
+        self.assertEqual(stats.total_records, single.total_records)
+        self.assertEqual(stats.files_moved, single.files_moved)
+        self.assertEqual(stats.unmatched_pdfs, single.unmatched_pdfs)
+        self.assertEqual(self.output_files(), expected_files)
+        self.assertEqual(self.manifest_destinations(), self.manifest_destinations(single_output))
+        self.assertTrue((self.output / Config.SHARD_REPORT_FILENAME).exists())
+        self.assertEqual(list(self.output.glob('*.shard-*')), [])
+
+    def test_node_manifest_does_not_copy_main_manifest(self):
+        single = self.organize().stats
+
+        skipped = 0
+        for index in range(3):
+            skipped += self.organize(shard=(index, 3)).stats.files_skipped
+
+        # Nada que colocar: los fragmentos no escriben manifiesto propio
+        self.assertEqual(skipped, single.files_moved)
+        self.assertEqual(list(self.output.glob(f"{Path(Config.MANIFEST_FILENAME).stem}.shard-*")), [])
+
+    def test_merge_requires_every_shard(self):
+        self.organize(shard=(0, 2)).save_shard_stats()
+        with self.assertRaises(OutputDirectoryError):
+            merge_shards(self.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,135 @@
+"""
+Modo de vigilancia: los PDFs que llegan se colocan sin volver a organizar todo.
+"""
+
+import contextlib
+import io
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import Config
+from data_handler import DataHandler
+from file_organizer import FileOrganizer
+from pdf_index import invoice_key
+from progress import CallbackReporter
+from watcher import PollingWatcher, WatchOrganizer, index_by_invoice
+
+HEADER = "Memo,Nombre del Solicitante,Factura,Name\n"
+
+
+class ArrivingPDFOrganizer(FileOrganizer):
+    """Organizador en el que llega un PDF justo después de indexar el directorio."""
+
+    arriving = None
+
+    def _prepare_run(self):
+        super()._prepare_run()
+        if self.arriving is not None:
+            (self.pdf_directory / self.arriving).write_bytes(b'%PDF tarde')
+
+
+class WatcherTest(unittest.TestCase):
+
+    def setUp(self):
+        self._temporary = tempfile.TemporaryDirectory()
+        self.root = Path(self._temporary.name)
+        self.pdfs = self.root / 'pdfs'
+        self.data = self.root / 'datos'
+        self.output = self.root / 'out'
+        self.pdfs.mkdir()
+        self.data.mkdir()
+        self._cache_directory = Config.CACHE_DIRECTORY
+        Config.CACHE_DIRECTORY = self.root / 'cache'
+        self.data_file = self.data / 'datos.csv'
+        self.data_file.write_text(HEADER + "Sede,Ana,A,Prov\nSede,Ana,B,Prov\nSede,Luis,B,Prov\n", encoding='utf-8')
+        (self.pdfs / 'A.pdf').write_bytes(b'%PDF A')
+        self.destination = self.output / 'Sede'
+
+    def tearDown(self):
+        Config.CACHE_DIRECTORY = self._cache_directory
+        self._temporary.cleanup()
+
+    @contextlib.contextmanager
+    def watching(self, organizer_class=FileOrganizer):
+        organizer = organizer_class(DataHandler(str(self.data_file)), str(self.pdfs), str(self.output),
+                                    progress=CallbackReporter(lambda event: None))
+        watch = WatchOrganizer(organizer)
+        thread = threading.Thread(target=self._run, args=(watch,))
+        thread.start()
+        try:
+            yield watch
+        finally:
+            watch.stop()
+            thread.join()
+
+    def _run(self, watch):
+        with contextlib.redirect_stdout(io.StringIO()):
+            watch.run()
+
+    def wait_for(self, condition, timeout=5.0):
+        deadline = time.monotonic() + timeout
+        while time.monotonic() < deadline:
+            if condition():
+                return True
+            time.sleep(0.05)
+        return False
+
+    def test_new_pdf_is_placed_for_every_record(self):
+        with self.watching() as watch:
+            self.assertTrue(self.wait_for(lambda: (self.destination / 'Ana' / 'Prov' / 'A.pdf').exists()))
+            (self.pdfs / 'B.pdf').write_bytes(b'%PDF B')
+            self.assertTrue(self.wait_for(lambda: (self.destination / 'Luis' / 'Prov' / 'B.pdf').exists()))
+            self.assertTrue((self.destination / 'Ana' / 'Prov' / 'B.pdf').exists())
+
+        # Las colocaciones de la vigilancia no cuentan como registros nuevos
+        self.assertEqual(watch.organizer.stats.total_records, 3)
+        self.assertEqual(watch.organizer.stats.files_moved, 3)
+
+    def test_pdf_arriving_during_initial_run_is_placed_once(self):
+        ArrivingPDFOrganizer.arriving = 'B.pdf'
+        try:
+            with self.watching(ArrivingPDFOrganizer) as watch:
+                self.assertTrue(self.wait_for(lambda: (self.destination / 'Luis' / 'Prov' / 'B.pdf').exists()))
+                # Se deja tiempo para que llegue también el evento encolado durante la organización
+                time.sleep(0.5)
+        finally:
+            ArrivingPDFOrganizer.arriving = None
+
+        self.assertEqual(watch.organizer.stats.files_moved, 3)
+        # El índice por factura sale de la organización inicial
+        self.assertEqual(sorted(watch.records_by_invoice), [invoice_key('A'), invoice_key('B')])
+
+    def test_data_change_places_new_rows(self):
+        (self.pdfs / 'C.pdf').write_bytes(b'%PDF C')
+        with self.watching():
+            self.assertTrue(self.wait_for(lambda: (self.destination / 'Ana' / 'Prov' / 'A.pdf').exists()))
+            with open(self.data_file, 'a', encoding='utf-8') as f:
+                f.write("Sede,Eva,C,Prov\n")
+            self.assertTrue(self.wait_for(lambda: (self.destination / 'Eva' / 'Prov' / 'C.pdf').exists()))
+
+    def test_polling_watcher_reports_stable_files(self):
+        watcher = PollingWatcher([self.pdfs], interval=0.01)
+        (self.pdfs / 'N.pdf').write_bytes(b'%PDF N')
+
+        reported = set()
+        for _ in range(3):
+            reported |= watcher.wait(0.01)
+
+        self.assertEqual(reported, {self.pdfs / 'N.pdf'})
+
+    def test_index_by_invoice_extends_existing_index(self):
+        index = index_by_invoice([('S', 'A', 'F1', 'P')])
+        index_by_invoice([('S', 'B', 'F1', 'P'), ('S', 'A', 'F2', 'P')], index)
+
+        self.assertEqual(index, {invoice_key('F1'): [('S', 'A', 'F1', 'P'), ('S', 'B', 'F1', 'P')],
+                                 invoice_key('F2'): [('S', 'A', 'F2', 'P')]})
+
+
+if __name__ == '__main__':
+    unittest.main()
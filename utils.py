@@ -3,19 +3,28 @@ Utilidades para el organizador de órdenes de compra.
 """
 
 import os
-import re
 import subprocess
 import platform
+from functools import lru_cache
 from pathlib import Path
 from typing import Optional
 
 from config import Config
+from pdf_index import is_pdf_name
 
 
+# Caracteres no válidos en nombres de archivo/carpeta, reemplazados por guiones bajos
+_INVALID_FILENAME_CHARS = str.maketrans({char: '_' for char in '<>:"/\\|?*'})
+
+
+@lru_cache(maxsize=Config.CLEAN_FILENAME_CACHE_SIZE, typed=True)
 def clean_filename(name: str) -> str:
     """
     Limpia el nombre del archivo/carpeta removiendo caracteres no válidos.
     
+    Los resultados se memorizan (con un tamaño máximo), ya que ubicaciones,
+    solicitantes y proveedores se repiten en muchísimos registros.
+    
     Args:
         name: Nombre a limpiar
         
@@ -26,7 +35,7 @@ def clean_filename(name: str) -> str:
         return "Sin_nombre"
     
     # Reemplaza caracteres problemáticos por guiones bajos
-    cleaned = re.sub(r'[<>:"/\\|?*]', '_', str(name))
+    cleaned = str(name).translate(_INVALID_FILENAME_CHARS)
     
     # Remueve espacios extra y los reemplaza por uno solo
     cleaned = ' '.join(cleaned.split())
@@ -87,9 +96,12 @@ def count_pdf_files(directory: str) -> int:
     Returns:
         Número de archivos PDF encontrados
     """
+    # Se cuentan las entradas del directorio tal cual: el índice de PDFs une
+    # las variantes de mayúsculas de un mismo nombre y daría otro número
     try:
-        return len(list(Path(directory).glob(f"*{Config.PDF_EXTENSION}")))
-    except Exception:
+        with os.scandir(directory) as entries:
+            return sum(1 for entry in entries if is_pdf_name(entry.name) and entry.is_file())
+    except OSError:
         return 0
 
 
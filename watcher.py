@@ -0,0 +1,331 @@
+"""
+Modo de vigilancia: organiza los PDFs nuevos a medida que aparecen.
+
+Tras una organización inicial completa, se vigila el directorio de PDFs y
+el archivo de datos. Cada PDF nuevo o modificado se coloca en cuanto
+termina de escribirse, buscando sus registros en un índice por factura en
+memoria; cuando cambia el archivo de datos se vuelve a leer y solo se
+aplican las filas nuevas o modificadas. Nunca se vuelve a recorrer la
+estructura de salida.
+
+En Linux se usa inotify (mediante ctypes, sin dependencias adicionales);
+en el resto de sistemas se sondean los directorios vigilados.
+"""
+
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from config import Config
+from data_handler import DataHandler
+from exceptions import DataFileError, FileOrganizerError
+from file_organizer import FileOrganizer
+from pdf_index import invoice_key, is_pdf_name
+
+Record = Tuple[str, str, str, str]
+
+# Constantes de inotify (linux/inotify.h)
+_IN_CLOSE_WRITE = 0x00000008
+_IN_MOVED_TO = 0x00000080
+_IN_Q_OVERFLOW = 0x00004000
+_EVENT_HEADER = struct.Struct('iIII')
+
+
+class DirectoryWatcher(ABC):
+    """Vigila directorios e informa de los archivos creados o modificados."""
+
+    @abstractmethod
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        """
+        Espera cambios durante como máximo timeout segundos.
+
+        Args:
+            timeout: Segundos de espera
+
+        Returns:
+            Archivos que terminaron de escribirse, o None si se perdieron
+            eventos y hay que volver a leer los directorios
+        """
+
+    def close(self) -> None:
+        """Libera los recursos del vigilante."""
+
+
+class PollingWatcher(DirectoryWatcher):
+    """
+    Vigilante por sondeo.
+
+    Un archivo se informa cuando su tamaño y fecha no cambian entre dos
+    sondeos consecutivos, para no colocar PDFs a medio escribir.
+    """
+
+    def __init__(self, directories: Iterable[Path], interval: float = Config.WATCH_POLL_INTERVAL):
+        """
+        Inicializa el vigilante con el estado actual de los directorios.
+
+        Args:
+            directories: Directorios a vigilar (solo su primer nivel)
+            interval: Segundos entre sondeos
+        """
+        self.directories = [Path(directory) for directory in directories]
+        self.interval = interval
+        self._seen = self._scan()
+        self._reported = dict(self._seen)
+
+    def _scan(self) -> Dict[Path, Tuple[int, int]]:
+        signatures = {}
+        for directory in self.directories:
+            try:
+                with os.scandir(directory) as iterator:
+                    for entry in iterator:
+                        try:
+                            if entry.is_file():
+                                file_stat = entry.stat()
+                                signatures[directory / entry.name] = (file_stat.st_size, file_stat.st_mtime_ns)
+                        except OSError:
+                            continue
+            except OSError:
+                continue
+        return signatures
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        time.sleep(min(timeout, self.interval))
+        current = self._scan()
+        changed = set()
+        for path, signature in current.items():
+            if signature == self._seen.get(path) and self._reported.get(path) != signature:
+                changed.add(path)
+                self._reported[path] = signature
+        # Los archivos eliminados se olvidan para poder informar si vuelven a aparecer
+        for path in self._reported.keys() - current.keys():
+            del self._reported[path]
+        self._seen = current
+        return changed
+
+
+class InotifyWatcher(DirectoryWatcher):
+    """Vigilante basado en inotify (Linux)."""
+
+    def __init__(self, directories: Iterable[Path]):
+        """
+        Inicializa el vigilante.
+
+        Args:
+            directories: Directorios a vigilar (solo su primer nivel)
+
+        Raises:
+            OSError: Si inotify no está disponible
+        """
+        libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), "inotify_init1")
+        self._directories: Dict[int, Path] = {}
+        try:
+            for directory in directories:
+                directory = Path(directory)
+                descriptor = libc.inotify_add_watch(
+                    self._fd, os.fsencode(directory), _IN_CLOSE_WRITE | _IN_MOVED_TO
+                )
+                if descriptor < 0:
+                    raise OSError(ctypes.get_errno(), f"inotify_add_watch: {directory}")
+                self._directories[descriptor] = directory
+        except BaseException:
+            os.close(self._fd)
+            raise
+
+    def wait(self, timeout: float) -> Optional[Set[Path]]:
+        readable, _, _ = select.select([self._fd], [], [], timeout)
+        if not readable:
+            return set()
+        changed = set()
+        while True:
+            try:
+                data = os.read(self._fd, 64 * 1024)
+            except BlockingIOError:
+                return changed
+            offset = 0
+            while offset < len(data):
+                descriptor, mask, _, name_length = _EVENT_HEADER.unpack_from(data, offset)
+                offset += _EVENT_HEADER.size
+                name = data[offset:offset + name_length].rstrip(b'\0')
+                offset += name_length
+                if mask & _IN_Q_OVERFLOW:
+                    return None
+                directory = self._directories.get(descriptor)
+                if directory is not None and name:
+                    changed.add(directory / os.fsdecode(name))
+
+    def close(self) -> None:
+        os.close(self._fd)
+
+
+def create_watcher(directories: Iterable[Path]) -> DirectoryWatcher:
+    """
+    Crea el mejor vigilante disponible para el sistema.
+
+    Args:
+        directories: Directorios a vigilar
+
+    Returns:
+        InotifyWatcher en Linux, PollingWatcher en el resto de casos
+    """
+    directories = list(dict.fromkeys(Path(directory) for directory in directories))
+    if sys.platform.startswith('linux'):
+        try:
+            return InotifyWatcher(directories)
+        except (OSError, AttributeError):
+            pass
+    return PollingWatcher(directories)
+
+
+def index_by_invoice(records: Iterable[Record],
+                     index: Optional[Dict[str, List[Record]]] = None) -> Dict[str, List[Record]]:
+    """
+    Agrupa los registros por factura.
+
+    Args:
+        records: Tuplas (ubicación, solicitante, factura, proveedor)
+        index: Índice al que añadir los registros (por defecto, uno nuevo)
+
+    Returns:
+        Diccionario invoice_key(factura) -> registros, en el orden original
+    """
+    if index is None:
+        index = {}
+    for record in records:
+        index.setdefault(invoice_key(record[2]), []).append(record)
+    return index
+
+
+class WatchOrganizer:
+    """Mantiene organizada la salida mientras llegan PDFs nuevos."""
+
+    def __init__(self, organizer: FileOrganizer):
+        """
+        Inicializa el modo de vigilancia.
+
+        Args:
+            organizer: Organizador con un archivo de datos
+
+        Raises:
+            DataFileError: Si el organizador no tiene archivo de datos
+        """
+        if organizer.data_handler is None:
+            raise DataFileError("El modo de vigilancia necesita un archivo de datos")
+        self.organizer = organizer
+        self.pdf_directory = organizer.pdf_directory.resolve()
+        self.data_file = Path(organizer.data_handler.file_path).resolve()
+        self.records_by_invoice: Dict[str, List[Record]] = {}
+        self._stop = threading.Event()
+
+    def stop(self) -> None:
+        """Pide que termine la vigilancia (se puede llamar desde otro hilo)."""
+        self._stop.set()
+
+    def _place_records(self, records: List[Record]) -> None:
+        if records:
+            # Los registros ya se contaron en la organización inicial o al recargar los datos
+            self.organizer.progress.records_loaded(len(records))
+            self.organizer.place_batch(records, None)
+            if self.organizer.manifest is not None:
+                self.organizer.manifest.flush()
+
+    def _on_pdf_changed(self, name: str) -> None:
+        pdf_index = self.organizer.pdf_index
+        known = pdf_index.entries.get(invoice_key(name[:-len(Config.PDF_EXTENSION)]))
+        entry = pdf_index.refresh(name)
+        if entry is None or entry == known:
+            # Sin cambios desde que se indexó: ya se colocó (p. ej. un evento encolado durante la organización inicial)
+            return
+        records = self.records_by_invoice.get(invoice_key(name[:-len(Config.PDF_EXTENSION)]))
+        if not records:
+            print(f"🔔 PDF sin registros en los datos: {name}")
+            return
+        print(f"🔔 PDF recibido: {name}")
+        self._place_records(records)
+
+    def _on_data_changed(self) -> None:
+        # Los registros se leen igual que en la organización inicial (streaming incluido):
+        # con otra lectura las facturas podrían no coincidir con las ya colocadas
+        previous_handler = self.organizer.data_handler
+        try:
+            handler = DataHandler(str(self.data_file), use_cache=previous_handler.cache is not None,
+                                  backend=previous_handler.backend.name)
+            self.organizer.data_handler = handler
+            records = list(self.organizer.iter_records())
+        except FileOrganizerError as e:
+            self.organizer.data_handler = previous_handler
+            print(f"⚠️  No se pudo recargar {self.data_file.name}: {e}")
+            return
+
+        new_index = index_by_invoice(records)
+        changed: List[Record] = []
+        for invoice, invoice_records in new_index.items():
+            previous = self.records_by_invoice.get(invoice)
+            if previous != invoice_records:
+                known = set(previous or ())
+                changed.extend(record for record in invoice_records if record not in known)
+        self.records_by_invoice = new_index
+        print(f"🔔 Datos recargados: {len(changed)} filas nuevas o modificadas")
+        # Las filas sin PDF todavía quedan a la espera de que llegue su archivo
+        self._place_records([record for record in changed if record[2] in self.organizer.pdf_index])
+
+    def _sync_pdf_directory(self) -> None:
+        # Coloca los PDFs nuevos o modificados respecto al índice; los que no cambiaron se omiten
+        with os.scandir(self.organizer.pdf_directory) as iterator:
+            names = [entry.name for entry in iterator if is_pdf_name(entry.name)]
+        for name in {entry.name for entry in self.organizer.pdf_index} - set(names):
+            self.organizer.pdf_index.refresh(name)
+        for name in names:
+            self._on_pdf_changed(name)
+
+    def _rescan(self) -> None:
+        print("⚠️  Se perdieron eventos; releyendo el directorio de PDFs")
+        self._sync_pdf_directory()
+        self._on_data_changed()
+
+    def run(self) -> None:
+        """Organiza todo una vez y sigue vigilando hasta que se llame a stop() o se pulse Ctrl+C."""
+        # El vigilante se crea antes de indexar los PDFs: lo que llegue durante la
+        # organización inicial queda en cola en lugar de perderse
+        watcher = create_watcher([self.pdf_directory, self.data_file.parent])
+        try:
+            self.records_by_invoice = {}
+            self.organizer.organize_files(
+                on_batch=lambda records: index_by_invoice(records, self.records_by_invoice))
+        except BaseException:
+            watcher.close()
+            raise
+        self.organizer.progress.start(self.organizer.output_directory)
+
+        print(f"\n👀 Vigilando {self.pdf_directory} ({type(watcher).__name__}). Ctrl+C para terminar.")
+        try:
+            # PDFs que llegaron o cambiaron mientras se indexaba y organizaba
+            self._sync_pdf_directory()
+            while not self._stop.is_set():
+                changes = watcher.wait(Config.WATCH_POLL_INTERVAL)
+                if changes is None:
+                    self._rescan()
+                    continue
+                for path in sorted(changes):
+                    if path.resolve() == self.data_file:
+                        self._on_data_changed()
+                    elif path.parent == self.pdf_directory and is_pdf_name(path.name):
+                        self._on_pdf_changed(path.name)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            watcher.close()
+            if self.organizer.manifest is not None:
+                self.organizer.manifest.close()
+            self.organizer.progress.finish()
+        print("\n👀 Vigilancia terminada")